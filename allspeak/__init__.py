@@ -5,10 +5,11 @@ speak their native language in their hearts"
 
 """
 from .allspeak import Allspeak  # noqa
-from .i18n import I18n, pluralize  # noqa
+from .bundle import compile_bundles  # noqa
+from .i18n import I18n, pluralize, pluralize_many  # noqa
 from .integrations import *  # noqa
 from .l10n import L10n  # noqa
-from .reader import Reader, parse_yaml  # noqa
+from .reader import Reader, get_json_data, parse_yaml  # noqa
 from .request_manager import RequestManager  # noqa
 from .utils import *  # noqa
 from .version import __version__  # noqa
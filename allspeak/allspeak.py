@@ -21,6 +21,30 @@ class Allspeak(I18n, L10n):
     :param markup: overwrite the function used by `translate` to flags HTML
         code as 'safe'. `markupsafe.Markup` is used by default.
 
+    :param cache_path: optional path of a file where to store a snapshot of
+        the parsed translation files.
+
+    :param processes: optional number of processes used to parse the
+        translation files concurrently.
+
+    :param lazy: if `True`, the translations of each locale are loaded the
+        first time they are needed instead of all at the start.
+
+    :param reload_missing: `"never"`, `"ttl"` or `"always"`. When to look
+        again for a requested locale that couldn't be found.
+
+    :param reload_missing_ttl: seconds between attempts to load a missing
+        locale when `reload_missing` is `"ttl"`.
+
+    :param watch: optional interval, in seconds, to check the translation
+        files for changes and reload the affected locales.
+
+    :param yaml_backend: the parser used for the yaml files: `"poyo"`,
+        `"pyyaml"` or `"auto"` (the default, PyYAML if available).
+
+    :param compact: use less memory to store the translations, at the
+        cost of slightly slower lookups. See :class:`I18n`.
+
     :param date_formats: update the defaults date formats.
 
     """
@@ -0,0 +1,182 @@
+import copy
+import hashlib
+import io
+import json
+import os
+from os.path import join, exists
+
+from babel.plural import to_javascript
+
+from . import utils
+from .reader import Reader, deep_update
+
+
+__all__ = ["compile_bundles"]
+
+BUNDLE_FORMATS = ("js", "json")
+MANIFEST_NAME = "manifest.json"
+
+
+def compile_bundles(
+    folderpath,
+    output,
+    locales=None,
+    prefixes=None,
+    format="js",
+    plural_rules=True,
+    reader=None,
+):
+    """Compile the translations into a minified bundle per locale, to be
+    served as static files and used client-side.
+
+    Each bundle is named after its locale and a hash of its content
+    (eg. `es_PE.5d41402a.js`). A `manifest.json` file, mapping each locale
+    to its bundle, is also written to the output folder, and used to only
+    write again the bundles of the locales that have changed.
+
+    The manifest has a section per format and prefixes (eg. `"js"` or
+    `"json:cat,forms.errors"`), so several kinds of bundles can be
+    compiled to the same folder without removing each other.
+
+    The country-specific bundles (eg. `es_PE`) include the translations
+    of the general language (eg. `es`) they don't overwrite.
+
+    :param folderpath: path or a list of paths that will be searched for
+        the translations.
+    :param output: the folder where to write the bundles.
+    :param locales: optional list of locales to compile. By default, all.
+    :param prefixes: optional list of keys (eg. `['js', 'forms.errors']`).
+        If given, only the translations under those keys are included.
+    :param format: `"js"`, a script that adds the bundle to
+        ``window.allspeak[locale]``, or `"json"`.
+    :param plural_rules: include the CLDR plural rules of the locale: as a
+        javascript function in the `"js"` format or as the CLDR
+        definitions in the `"json"` format.
+    :param reader: optional :class:`Reader` instance to use, eg. to take
+        advantage of its snapshot cache.
+
+    :return: a dictionary with the locales as keys and a tuple
+        ``(filename, changed)`` as values.
+
+    """
+    assert format in BUNDLE_FORMATS, "Unknown bundle format `{}`".format(format)
+    if reader is None:
+        reader = Reader(folderpath)
+        folderpath = None
+    translations = reader.load_translations(folderpath=folderpath, locales=locales)
+    if locales:
+        wanted = [utils.locale_to_str(locale) for locale in locales]
+    else:
+        wanted = sorted(translations.keys())
+
+    if not exists(output):
+        os.makedirs(output)
+    manifest = _read_manifest(output)
+    section = manifest.setdefault(_get_section_name(format, prefixes), {})
+
+    result = {}
+    for strlocale in wanted:
+        messages = _get_messages(translations, strlocale, prefixes)
+        content = _render_bundle(strlocale, messages, format, plural_rules)
+        content = content.encode("utf8")
+        digest = hashlib.sha1(content).hexdigest()[:8]
+        filename = "{}.{}.{}".format(strlocale, digest, format)
+
+        old_filename = section.get(strlocale)
+        changed = old_filename != filename or not exists(join(output, filename))
+        if changed:
+            with io.open(join(output, filename), mode="wb") as f:
+                f.write(content)
+            if old_filename and old_filename != filename:
+                _remove(join(output, old_filename))
+        section[strlocale] = filename
+        result[strlocale] = (filename, changed)
+
+    if any(changed for _, changed in result.values()):
+        _write_manifest(output, manifest)
+    return result
+
+
+def _get_section_name(format, prefixes=None):
+    if not prefixes:
+        return format
+    prefixes = sorted(set(prefix.strip(".") for prefix in prefixes))
+    return "{}:{}".format(format, ",".join(prefixes))
+
+
+def _get_messages(translations, strlocale, prefixes=None):
+    language = strlocale.split("_")[0]
+    messages = {}
+    if language != strlocale and language in translations:
+        messages = copy.deepcopy(translations[language])
+    deep_update(messages, translations.get(strlocale) or {})
+    if prefixes:
+        messages = _filter_prefixes(messages, prefixes)
+    return messages
+
+
+def _filter_prefixes(messages, prefixes):
+    """Return a copy of the `messages` with only the values under the
+    (dotted) keys in `prefixes`.
+    """
+    result = {}
+    for prefix in prefixes:
+        path = prefix.strip(".").split(".")
+        value = messages
+        for key in path:
+            if not isinstance(value, dict) or key not in value:
+                value = None
+                break
+            value = value[key]
+        if value is None:
+            continue
+        target = result
+        for key in path[:-1]:
+            target = target.setdefault(key, {})
+        target[path[-1]] = copy.deepcopy(value)
+    return result
+
+
+def _render_bundle(strlocale, messages, format, plural_rules):
+    locale = utils.normalize_locale(strlocale)
+    data = {"locale": strlocale, "messages": messages}
+    if format == "json":
+        if plural_rules and locale:
+            data["plural_rules"] = locale.plural_form.rules
+        return _dumps(data)
+
+    plural = "null"
+    if plural_rules and locale:
+        plural = to_javascript(locale.plural_form)
+    return (
+        "(function(w){{w.allspeak=w.allspeak||{{}};"
+        "var b={data};b.plural={plural};w.allspeak[{key}]=b;}})(this);"
+    ).format(data=_dumps(data), plural=plural, key=_dumps(strlocale))
+
+
+def _dumps(data):
+    return json.dumps(data, ensure_ascii=False, separators=(",", ":"), default=str)
+
+
+def _read_manifest(output):
+    path = join(output, MANIFEST_NAME)
+    if not exists(path):
+        return {}
+    with io.open(path, mode="r", encoding="utf8") as f:
+        manifest = json.load(f)
+    # Ignore the entries of an older, not sectioned, manifest
+    return {
+        name: section for name, section in manifest.items() if isinstance(section, dict)
+    }
+
+
+def _write_manifest(output, manifest):
+    with io.open(join(output, MANIFEST_NAME), mode="w", encoding="utf8") as f:
+        f.write(json.dumps(manifest, indent=2, sort_keys=True))
+
+
+def _remove(path):
+    try:
+        os.remove(path)
+    except OSError:
+        pass
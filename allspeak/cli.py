@@ -0,0 +1,156 @@
+import argparse
+import sys
+
+from .bundle import BUNDLE_FORMATS, compile_bundles
+from .extract import EXTENSIONS, scan_files, find_missing_keys
+from .i18n import I18n
+from .reader import Reader
+
+
+def main(args=None):
+    """Entry point of the `allspeak` command."""
+    parser = get_parser()
+    options = parser.parse_args(args)
+    if not getattr(options, "run", None):
+        parser.print_help()
+        return 2
+    return options.run(options)
+
+
+def get_parser():
+    parser = argparse.ArgumentParser(
+        prog="allspeak", description="Allspeak translations tools."
+    )
+    commands = parser.add_subparsers(title="commands")
+
+    compile_ = commands.add_parser(
+        "compile",
+        help="Compile the translations into client-side bundles.",
+        description=(
+            "Compile the translations into minified, content-hashed, "
+            "bundles per locale. Only the bundles of the locales that "
+            "have changed are written again."
+        ),
+    )
+    compile_.add_argument(
+        "folderpath", nargs="+", help="folders with the translation files"
+    )
+    compile_.add_argument(
+        "-o", "--output", required=True, help="where to write the bundles"
+    )
+    compile_.add_argument(
+        "-l",
+        "--locale",
+        action="append",
+        dest="locales",
+        help="compile only this locale (can be used more than once)",
+    )
+    compile_.add_argument(
+        "-p",
+        "--prefix",
+        action="append",
+        dest="prefixes",
+        help="include only the translations under this key "
+        "(can be used more than once)",
+    )
+    compile_.add_argument(
+        "-f", "--format", choices=BUNDLE_FORMATS, default="js", help="default: js"
+    )
+    compile_.add_argument(
+        "--no-plural-rules",
+        action="store_false",
+        dest="plural_rules",
+        help="don't include the plural rules of the locales",
+    )
+    compile_.add_argument(
+        "--cache",
+        dest="cache_path",
+        help="path of a snapshot cache of the parsed translation files",
+    )
+    compile_.set_defaults(run=run_compile)
+
+    extract = commands.add_parser(
+        "extract",
+        help="Find the translation keys used in the code that are missing.",
+        description=(
+            "Scan the Python and Jinja2 source files for the keys used in "
+            "`translate(...)`, `lazy_translate(...)` and `_(...)` calls and "
+            "report the ones missing from the translations. "
+            "Exits with 1 if any key is missing."
+        ),
+    )
+    extract.add_argument("sources", nargs="+", help="source files or folders")
+    extract.add_argument(
+        "-t",
+        "--translations",
+        action="append",
+        required=True,
+        dest="folderpath",
+        help="folder with the translation files (can be used more than once)",
+    )
+    extract.add_argument(
+        "-l",
+        "--locale",
+        action="append",
+        dest="locales",
+        help="check only this locale (can be used more than once)",
+    )
+    extract.add_argument(
+        "-e",
+        "--extension",
+        action="append",
+        dest="extensions",
+        help="scan the files with this extension (can be used more than once). "
+        "Default: {}".format(", ".join(EXTENSIONS)),
+    )
+    extract.add_argument(
+        "-j",
+        "--processes",
+        type=int,
+        default=None,
+        help="scan the files using this many processes",
+    )
+    extract.add_argument(
+        "--cache",
+        dest="cache_path",
+        help="path of a cache of the keys found in each source file",
+    )
+    extract.set_defaults(run=run_extract)
+
+    return parser
+
+
+def run_compile(options):
+    reader = Reader(options.folderpath, cache_path=options.cache_path)
+    result = compile_bundles(
+        None,
+        options.output,
+        locales=options.locales,
+        prefixes=options.prefixes,
+        format=options.format,
+        plural_rules=options.plural_rules,
+        reader=reader,
+    )
+    for strlocale, (filename, changed) in sorted(result.items()):
+        print("{}  {}".format("updated  " if changed else "unchanged", filename))
+    return 0
+
+
+def run_extract(options):
+    keys_by_file = scan_files(
+        options.sources,
+        extensions=tuple(ext.strip(".") for ext in options.extensions or EXTENSIONS),
+        cache_path=options.cache_path,
+        processes=options.processes,
+    )
+    i18n = I18n(options.folderpath)
+    missing = find_missing_keys(keys_by_file, i18n, locales=options.locales)
+    for strlocale, keys in sorted(missing.items()):
+        print("{} ({} missing)".format(strlocale, len(keys)))
+        for key, places in sorted(keys.items()):
+            print("  {}  {}".format(key, ", ".join(places)))
+    return 1 if missing else 0
+
+
+if __name__ == "__main__":  # pragma:no cover
+    sys.exit(main())
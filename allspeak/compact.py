@@ -0,0 +1,115 @@
+import sys
+from collections.abc import Mapping
+
+
+__all__ = ["CompactIndex", "intern_translations", "get_memory_size"]
+
+
+class CompactIndex(Mapping):
+
+    """A read-only, flat, translations index of a locale that stores only
+    a tuple of values.
+
+    The dotted keys, and the position of their values in the tuple, live
+    in a `slots` dictionary shared by the indexes of all the locales, so
+    each key is stored only once no matter how many locales define it.
+    Looking up a key is a little slower than with a regular dictionary.
+
+    :param slots: the shared dictionary of keys and positions.
+    :param index: a flat dictionary of translations to compact. New keys
+        are added to `slots`.
+
+    """
+
+    __slots__ = ("_slots", "_values", "_len")
+
+    def __init__(self, slots, index):
+        for key in index:
+            if key not in slots:
+                slots[sys.intern(key)] = len(slots)
+        values = [None] * len(slots)
+        for key, value in index.items():
+            values[slots[key]] = value
+        self._slots = slots
+        self._values = tuple(values)
+        self._len = len(index)
+
+    def __repr__(self):
+        return "<{cname} ({len} keys)>".format(
+            cname=self.__class__.__name__, len=self._len
+        )
+
+    def get(self, key, default=None):
+        slot = self._slots.get(key)
+        # Keys added to `slots` after this index was built are out of range
+        if slot is None or slot >= len(self._values):
+            return default
+        value = self._values[slot]
+        return default if value is None else value
+
+    def __getitem__(self, key):
+        value = self.get(key)
+        if value is None:
+            raise KeyError(key)
+        return value
+
+    def __contains__(self, key):
+        return self.get(key) is not None
+
+    def __iter__(self):
+        values = self._values
+        size = len(values)
+        for key, slot in list(self._slots.items()):
+            if slot < size and values[slot] is not None:
+                yield key
+
+    def __len__(self):
+        return self._len
+
+
+def intern_translations(translations):
+    """Return a copy of a nested translations dictionary with all of its
+    string keys and values interned, so the equal strings of different
+    files and locales (eg. the English texts copied as a placeholder into
+    other locales) are stored only once.
+    """
+    result = {}
+    stack = [(result, translations)]
+    while stack:
+        target, source = stack.pop()
+        for key, value in source.items():
+            if type(key) is str:
+                key = sys.intern(key)
+            if isinstance(value, dict):
+                child = {}
+                stack.append((child, value))
+                value = child
+            elif type(value) is str:
+                value = sys.intern(value)
+            target[key] = value
+    return result
+
+
+def get_memory_size(*objs):
+    """Return an estimate, in bytes, of the memory used by the objects and
+    everything inside them (dictionaries, lists, tuples and sets are
+    followed). Objects shared between them are counted only once.
+    """
+    seen = set()
+    size = 0
+    stack = list(objs)
+    while stack:
+        obj = stack.pop()
+        if id(obj) in seen:
+            continue
+        seen.add(id(obj))
+        size += sys.getsizeof(obj)
+        if isinstance(obj, dict):
+            stack.extend(obj.keys())
+            stack.extend(obj.values())
+        elif isinstance(obj, (list, tuple, set, frozenset)):
+            stack.extend(obj)
+        elif isinstance(obj, CompactIndex):
+            stack.append(obj._slots)
+            stack.append(obj._values)
+    return size
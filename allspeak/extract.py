@@ -0,0 +1,182 @@
+import hashlib
+import io
+import json
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+from os.path import join, isdir, splitext, abspath
+
+from .i18n import I18n
+
+
+__all__ = ["extract_keys", "scan_files", "find_missing_keys"]
+
+EXTENSIONS = ("py", "html", "jinja", "jinja2", "j2")
+CACHE_VERSION = 1
+
+# A call to `translate`, `lazy_translate` or `_` (as a function or as
+# a method) with a string literal as the first argument.
+KEY_RE = re.compile(
+    r"""(?<![\w])(?:lazy_translate|translate|_)\s*\(\s*(['"])([^'"\\\n]+)\1"""
+)
+
+
+def extract_keys(source):
+    """Return a list of ``(key, lineno)`` tuples with the translation keys
+    used in a Python or Jinja2 source code: the string literals used as
+    the first argument of ``translate(...)``, ``lazy_translate(...)`` or
+    ``_(...)``.
+
+    >> extract_keys('{{ _("hello") }}\\n{{ i18n.translate("bye", 2) }}')
+    [('hello', 1), ('bye', 2)]
+
+    """
+    keys = []
+    lineno = 1
+    pos = 0
+    for match in KEY_RE.finditer(source):
+        lineno += source.count("\n", pos, match.start())
+        pos = match.start()
+        keys.append((match.group(2), lineno))
+    return keys
+
+
+def find_source_files(paths, extensions=EXTENSIONS):
+    """Return the list of files in `paths` (files or folders) with one of
+    the `extensions`, ignoring hidden files and folders.
+    """
+    filepaths = []
+    for path in paths:
+        path = abspath(path)
+        if not isdir(path):
+            filepaths.append(path)
+            continue
+        for root, dirnames, filenames in os.walk(path):
+            dirnames[:] = sorted(name for name in dirnames if not name.startswith("."))
+            for filename in sorted(filenames):
+                if filename.startswith("."):
+                    continue
+                if splitext(filename)[1].strip(".") in extensions:
+                    filepaths.append(join(root, filename))
+    return filepaths
+
+
+def scan_files(paths, extensions=EXTENSIONS, cache_path=None, processes=None):
+    """Extract the translation keys used in the source files in `paths`.
+
+    :param paths: list of files or folders to scan.
+    :param extensions: extensions of the files to scan inside the folders.
+    :param cache_path: optional path of a file where to store the keys found
+        in each file, with the hash of its content, so the next time only the
+        files that have changed are scanned again.
+    :param processes: when set, scan the files using a pool of that many
+        processes.
+
+    :return: a dictionary with the file paths as keys and lists of
+        ``(key, lineno)`` tuples as values.
+    """
+    filepaths = find_source_files(paths, extensions=extensions)
+    cache = _read_cache(cache_path)
+    result = {}
+    pending = []
+    for filepath in filepaths:
+        entry = cache.get(filepath)
+        if entry and entry["stat"] == list(_get_stat(filepath)):
+            result[filepath] = [tuple(key) for key in entry["keys"]]
+        else:
+            pending.append(filepath)
+
+    if processes and processes > 1 and len(pending) > 1:
+        chunksize = max(1, len(pending) // (processes * 4))
+        with ProcessPoolExecutor(max_workers=processes) as executor:
+            scanned = list(
+                executor.map(_scan_file, pending, chunksize=chunksize)
+            )
+    else:
+        scanned = [_scan_file(filepath) for filepath in pending]
+
+    changed = False
+    for filepath, (stat, digest, content) in zip(pending, scanned):
+        entry = cache.get(filepath)
+        if entry and entry["hash"] == digest:
+            # Touched, but not really modified
+            keys = [tuple(key) for key in entry["keys"]]
+        else:
+            keys = extract_keys(content)
+        result[filepath] = keys
+        cache[filepath] = {"stat": list(stat), "hash": digest, "keys": keys}
+        changed = True
+
+    if cache_path and (changed or len(cache) != len(result)):
+        _write_cache(cache_path, {path: cache[path] for path in result})
+    return result
+
+
+def find_missing_keys(keys_by_file, i18n, locales=None):
+    """Return the keys used in the source files that are not defined
+    for some locales.
+
+    :param keys_by_file: the result of :func:`scan_files`.
+    :param i18n: an :class:`I18n` instance or the path (or list of paths)
+        of the translation files.
+    :param locales: optional list of locales to check. By default,
+        all the available ones.
+
+    :return: a dictionary with the locales as keys and, as values, a
+        dictionary of the missing keys and the list of places (as
+        ``"filepath:lineno"``) where each one is used.
+    """
+    if not isinstance(i18n, I18n):
+        i18n = I18n(i18n)
+    if not locales:
+        locales = sorted(i18n.translations.keys())
+
+    used = {}
+    for filepath, keys in keys_by_file.items():
+        for key, lineno in keys:
+            used.setdefault(key, []).append("{}:{}".format(filepath, lineno))
+
+    missing = {}
+    for locale in locales:
+        index = i18n.get_key_index(locale) or {}
+        locale_missing = {
+            key: places for key, places in used.items() if key not in index
+        }
+        if locale_missing:
+            missing[str(locale)] = locale_missing
+    return missing
+
+
+def _get_stat(filepath):
+    stat = os.stat(filepath)
+    return (stat.st_mtime_ns, stat.st_size)
+
+
+def _scan_file(filepath):
+    """Return the stat, the hash and the content of a source file.
+    """
+    stat = _get_stat(filepath)
+    with io.open(filepath, mode="rb") as f:
+        data = f.read()
+    digest = hashlib.sha1(data).hexdigest()
+    return stat, digest, data.decode("utf8", "replace")
+
+
+def _read_cache(cache_path):
+    if not cache_path or not os.path.exists(cache_path):
+        return {}
+    try:
+        with io.open(cache_path, mode="r", encoding="utf8") as f:
+            cache = json.load(f)
+    except ValueError:
+        return {}
+    if cache.get("version") != CACHE_VERSION:
+        return {}
+    return cache.get("files") or {}
+
+
+def _write_cache(cache_path, files):
+    tmppath = "{}.{}.tmp".format(cache_path, os.getpid())
+    with io.open(tmppath, mode="w", encoding="utf8") as f:
+        json.dump({"version": CACHE_VERSION, "files": files}, f)
+    os.replace(tmppath, cache_path)
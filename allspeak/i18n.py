@@ -1,11 +1,20 @@
+import threading
+import time
+from functools import lru_cache, partial
+from string import Formatter
+
 from babel import Locale
 from markupsafe import Markup
 
 from . import utils
+from .compact import CompactIndex, intern_translations, get_memory_size
 from .reader import Reader
 from .request_manager import RequestManager
 
 
+PLURAL_TABLE_SIZE = 1000
+
+
 class I18n(RequestManager):
 
     """Internationalization functions.
@@ -23,14 +32,94 @@ class I18n(RequestManager):
     :param markup: overwrite the function used by `translate` to flags HTML
         code as 'safe'. `markupsafe.Markup` is used by default.
 
+    :param cache_path: optional path of a file where the :class:`Reader`
+        stores a snapshot of the parsed translation files, so they aren't
+        parsed again unless they change.
+
+    :param processes: optional number of processes the :class:`Reader` uses
+        to parse the translation files concurrently.
+
+    :param lazy: if `True`, instead of loading all the translations at the
+        start, the translations of each locale are loaded the first time
+        they are needed.
+
+    :param reload_missing: what to do when a locale without translations
+        is requested again, after the first failed attempt to load it:
+
+        - `"never"` (default): don't look for it again until
+          `load_translations` is explicitly called.
+        - `"ttl"`: look for it again if more than `reload_missing_ttl`
+          seconds have passed since the last attempt.
+        - `"always"`: look for it again every time.
+
+    :param reload_missing_ttl: seconds to wait between attempts to load a
+        missing locale when `reload_missing` is `"ttl"`.
+
+    :param watch: optional interval, in seconds, to check the translation
+        files for changes and reload the affected locales. See `watch`.
+
+    :param yaml_backend: the parser used for the yaml files: `"poyo"`,
+        `"pyyaml"` or `"auto"` (the default, PyYAML if available).
+
+    :param compact: if `True`, use less memory to store the translations,
+        at the cost of slightly slower lookups: all the strings are
+        interned, so the duplicated ones are stored only once, and the
+        index of each locale is a :class:`CompactIndex`, where the keys are
+        shared by all the locales. See :meth:`memory_footprint`.
+
     """
 
-    def __init__(self, folderpath=utils.LOCALES_FOLDER, markup=Markup, **kwargs):
-        self.reader = Reader(folderpath)
+    RELOAD_MISSING_POLICIES = ("never", "ttl", "always")
+
+    def __init__(
+        self,
+        folderpath=utils.LOCALES_FOLDER,
+        markup=Markup,
+        cache_path=None,
+        processes=None,
+        lazy=False,
+        reload_missing="never",
+        reload_missing_ttl=300,
+        watch=None,
+        yaml_backend="auto",
+        compact=False,
+        **kwargs
+    ):
+        assert reload_missing in self.RELOAD_MISSING_POLICIES, (
+            "`reload_missing` must be one of {}".format(self.RELOAD_MISSING_POLICIES)
+        )
+        self.reader = Reader(
+            folderpath,
+            cache_path=cache_path,
+            processes=processes,
+            keep_files_data=bool(watch),
+            yaml_backend=yaml_backend,
+        )
         self.markup = markup
-        self.load_translations()
+        self.lazy = lazy
+        self.compact = compact
+        self._key_slots = {}
+        self.reload_missing = reload_missing
+        self.reload_missing_ttl = reload_missing_ttl
+        self.missing_reloads_count = 0
+        self._missing_locales = {}
+        self._locale_keys = {}
+        self._reload_lock = threading.RLock()
+        self._watcher = None
         super(I18n, self).__init__(**kwargs)
-        self._set_available_locales(self.translations.keys())
+        if lazy:
+            self.reader.index_locales()
+        else:
+            self.load_translations()
+        self._update_available_locales()
+        if watch:
+            self.watch(watch)
+
+    def _update_available_locales(self):
+        if self.lazy:
+            self._set_available_locales(self.reader.locales_index.keys())
+        else:
+            self._set_available_locales(self.translations.keys())
 
     def __repr__(self):
         return "{cname}()".format(cname=self.__class__.__name__)
@@ -46,8 +135,98 @@ class I18n(RequestManager):
     def filepaths(self):
         return self.reader.filepaths
 
+    @property
+    def translations(self):
+        return self._translations
+
+    @translations.setter
+    def translations(self, value):
+        self._translations = value
+        self._key_index = {}
+        self._messages = {}
+        self._bound = {}
+
     def load_translations(self, *locales):
-        self.translations = self.reader.load_translations(locales=locales)
+        """Load the translations using the reader.
+
+        :param locales: optional locales to load. If given, only the
+            translations for these locales (and their general languages) are
+            read and they replace the ones already loaded for them.
+            Otherwise, all the translations are loaded again.
+        """
+        loaded = self.reader.load_translations(locales=locales)
+        if self.compact:
+            loaded = intern_translations(loaded)
+        if not locales:
+            self._key_slots = {}
+            self.translations = loaded
+            self._missing_locales = {}
+        else:
+            affected = set(loaded)
+            affected.update(utils.locale_to_str(locale) for locale in locales)
+            translations = self.translations.copy()
+            for strlocale in affected.difference(loaded):
+                translations.pop(strlocale, None)
+            translations.update(loaded)
+            key_index = {
+                strlocale: index
+                for strlocale, index in self._key_index.items()
+                if strlocale not in affected
+                and strlocale.split("_")[0] not in affected
+            }
+            # Replacing the dictionaries instead of updating them means
+            # concurrent calls to `translate` never see a half-updated state.
+            self.translations = translations
+            self._key_index = key_index
+
+        for strlocale in loaded:
+            self.get_key_index(strlocale)
+
+    def reload_changed(self):
+        """Check the translation files for changes and reload only the
+        locales defined in the files that were modified, added or removed.
+        The other locales are not read again.
+
+        :return: a sorted list of the reloaded locales.
+        """
+        return self._reload_locales(self.reader.find_changes())
+
+    def _reload_locales(self, locales):
+        if not locales:
+            return []
+        with self._reload_lock:
+            if self.lazy:
+                # Only the locales already loaded are read again, but the
+                # new ones must still be made available.
+                loaded = self.translations
+                locales = [
+                    strlocale
+                    for strlocale in locales
+                    if strlocale in loaded or strlocale.split("_")[0] in loaded
+                ]
+            if locales:
+                self.load_translations(*locales)
+            self._update_available_locales()
+        return sorted(locales)
+
+    def watch(self, interval=1.0):
+        """Start checking the translation files for changes every
+        `interval` seconds, in a background thread, reloading the
+        affected locales when they change.
+
+        Only the changed files are parsed again; the parsed data of the
+        others is kept in memory for that purpose.
+        """
+        self.reader.keep_files_data = True
+        if self._watcher is None:
+            self._watcher = self.reader.watch(self._reload_locales, interval)
+
+    def stop_watching(self):
+        """Stop checking the translation files for changes.
+        """
+        if self._watcher is not None:
+            self._watcher.set()
+            self._watcher = None
 
     def get_translations_from_locale(self, locale):
         """Return the available translations for a locale: the
@@ -57,8 +236,8 @@ class I18n(RequestManager):
             string.
         """
         strlocale = utils.locale_to_str(locale)
-        if not self.translations or strlocale not in self.translations:
-            self.load_translations(locale)
+        if strlocale not in self.translations and self._should_load(strlocale):
+            self._load_missing_locale(strlocale)
 
         objs = []
         trans = self.translations.get(strlocale)
@@ -73,6 +252,36 @@ class I18n(RequestManager):
             objs.append(trans)
         return objs
 
+    def _load_missing_locale(self, strlocale):
+        # Each load replaces `self.translations` with an updated copy, so two
+        # loads at the same time would lose one of the updates.
+        with self._reload_lock:
+            # It could have been loaded by another thread in the meantime
+            if strlocale in self.translations or not self._should_load(strlocale):
+                return
+            self.missing_reloads_count += 1
+            self.load_translations(strlocale)
+            if strlocale in self.translations:
+                self._missing_locales.pop(strlocale, None)
+            else:
+                self._missing_locales[strlocale] = time.monotonic()
+
+    def _should_load(self, strlocale):
+        """Decide if the translations of a locale, not currently loaded,
+        must be searched for, according to the `reload_missing` policy.
+        """
+        last_attempt = self._missing_locales.get(strlocale)
+        if last_attempt is None or self.reload_missing == "always":
+            return True
+        if self.reload_missing == "ttl":
+            return time.monotonic() - last_attempt >= self.reload_missing_ttl
+        return False
+
+    @property
+    def missing_locales(self):
+        """The locales that were requested but couldn't be found."""
+        return list(self._missing_locales.keys())
+
     def key_lookup(self, locale, key):
         """Return the value of the translation for the given key using the
         current locale. It tries first with the country-specific (eg `en-US`)
@@ -83,20 +292,59 @@ class I18n(RequestManager):
             string.
         :param key: a string, the ID of the looked up translation
         """
-        translations = self.get_translations_from_locale(locale)
-        if not translations:
+        index = self.get_key_index(locale)
+        if not index:
             # Language not found!
             return None
+        return index.get(key)
+
+    def get_key_index(self, locale):
+        """Return a flat dictionary of all the translations for a locale,
+        with dotted keys (eg. `so.much.such`), so looking up a key is a
+        single dictionary access.
+
+        The translations of the general language are merged in, so the
+        country-specific values take precedence but everything else falls
+        back to the language ones.
+
+        The index is built once per locale and discarded whenever the
+        translations are reloaded or replaced.
+
+        :param locale: must be a :class:`babel.core.Locale` instance or a
+            string.
+        """
+        strlocale = utils.locale_to_str(locale)
+        current, key_index = self._translations, self._key_index
+        index = key_index.get(strlocale)
+        if index is not None:
+            return index
 
-        for trans in translations:
-            for subkey in key.split("."):
-                value = trans.get(subkey)
-                if value is None:
-                    break
-                trans = value
-            if value is not None:
-                return value
-        return None
+        translations = self.get_translations_from_locale(strlocale)
+        if not translations:
+            return None
+        index = _build_key_index(reversed(translations))
+        if self.compact:
+            index = CompactIndex(self._key_slots, index)
+        # If the translations were replaced in the meantime (eg. by the
+        # watcher), this index could be outdated, so it's not stored.
+        if self._translations is current:
+            key_index[strlocale] = index
+        return index
+
+    def memory_footprint(self):
+        """Return an estimate of the memory used by the loaded translations,
+        in bytes, as a dictionary with the keys `translations` (the nested
+        dictionaries), `key_index` (the indexes of the locales, not counting
+        the values already in the translations) and `total`.
+        """
+        indexes = list(self._key_index.values())
+        translations = get_memory_size(self.translations)
+        total = get_memory_size(self.translations, indexes)
+        return {
+            "translations": translations,
+            "key_index": total - translations,
+            "total": total,
+        }
 
     def translate(self, key, count=None, locale=None, **kwargs):
         """Get the translation for the given key using the current locale.
@@ -132,8 +380,55 @@ class I18n(RequestManager):
 
         """
         key = str(key)
-        locale = utils.normalize_locale(locale) or self.get_locale()
-        value = self.key_lookup(locale, key)
+        context = None if locale else self._context.get()
+        if context is not None:
+            locale, index = self._get_context_index(context)
+            value = index.get(key)
+        else:
+            locale = utils.normalize_locale(locale) or self.get_locale()
+            value = self.key_lookup(locale, key)
+        return self._render(key, value, count, locale, kwargs)
+
+    def translate_many(self, keys, count=None, locale=None, **kwargs):
+        """Get the translations for several keys at once, using the same
+        locale, `count` and `kwargs` for all of them.
+
+        It works exactly as calling `translate` for each key, but the locale
+        and its translations are resolved only once.
+
+        Examples:
+
+            >> translate_many(['greeting', 'apple'], count=2)
+            {'greeting': 'Hello World!', 'apple': '2 apples'}
+
+        :param keys: an iterable of translation IDs.
+        :param count: used for the values that are dictionaries. See `translate`.
+        :param locale: must be a :class:`babel.core.Locale` instance or a
+            string.
+        :param **kwargs: for string interpolation of the values.
+
+        :return: a dictionary with the keys and their translations.
+
+        """
+        context = None if locale else self._context.get()
+        if context is not None:
+            locale, index = self._get_context_index(context)
+        else:
+            locale = utils.normalize_locale(locale) or self.get_locale()
+            index = self.get_key_index(locale) or {}
+        return _render_many(self._render, index, keys, count, locale, kwargs)
+
+    def _get_context_index(self, context):
+        """Inside `request_context`, the locale and its translations are
+        resolved only once for the whole request.
+        """
+        if context.key_index is None:
+            context.key_index = self.get_key_index(context.locale) or {}
+        return context.locale, context.key_index
+
+    def _render(self, key, value, count, locale, kwargs):
+        """Pluralize and format a translation value found for `key`.
+        """
         if value is None:
             return self.markup("<missing:{0}/>".format(key))
 
@@ -142,11 +437,44 @@ class I18n(RequestManager):
 
         if isinstance(value, str):
             kwargs.setdefault("count", count)
-            value = value.format(**kwargs)
-            return self.markup(value)
+            return self.markup(self.get_message(value).format(kwargs))
 
         return value
 
+    def for_locale(self, locale):
+        """Return a :class:`BoundTranslator` for a locale: an object with
+        `translate`, `pluralize` and (if this is also a :class:`L10n`) the
+        `format*` methods, that always use that locale.
+
+        The locale is normalized and its translations are looked up
+        only once, so a template can use this object instead of calling
+        `translate` with a `locale` argument every time.
+        The objects are cached until the translations are reloaded.
+
+        :param locale: must be a :class:`babel.core.Locale` instance or a
+            string.
+        """
+        strlocale = utils.locale_to_str(locale)
+        current, cache = self._translations, self._bound
+        bound = cache.get(strlocale)
+        if bound is None:
+            locale = utils.normalize_locale(locale) or self.default_locale
+            bound = BoundTranslator(self, locale, self.get_key_index(locale) or {})
+            # Like in `get_key_index`, an outdated object is not stored.
+            if self._translations is current:
+                cache[strlocale] = bound
+        return bound
+
+    def get_message(self, value):
+        """Return the :class:`Message` for a translation string, compiling it
+        the first time is used.
+        """
+        message = self._messages.get(value)
+        if message is None:
+            message = Message(value)
+            self._messages[value] = message
+        return message
+
     @property
     def lazy_translate(self):
         class LazyWrapper(object):
@@ -159,53 +487,248 @@ class I18n(RequestManager):
 
         return LazyWrapper
 
-    def _set_available_locales(self, available_locales):
-        _available = []
-        for locale in available_locales or [self.default_locale]:
-            lparts = utils.split_locale(locale)
-
-            lp = "_".join(lparts)
-            if lp not in _available:
-                _available.append(lp)
-
-            if len(lparts) > 1:
-                if lparts[0] not in _available:
-                    _available.append(lparts[0])
-        self.available_locales = _available
-
-    def test_for_incomplete_locales(self, *locales):
+    def test_for_incomplete_locales(self, *locales, sources=False):
         """Check a list of locales for keys that are defined in one but not in
         the other.
 
+        The flattened keys of each locale are cached, and only computed
+        again for the locales whose translations have been reloaded, so
+        calling this method again after :meth:`reload_changed` is cheap.
+
         :param locales: two or more locales as strings. If not provided, all
             of the available locales are tested.
 
+        :param sources: if `True`, also report in which files the missing
+            keys are defined (for the other locales).
+
         :return: a dictionary with strlocales as keys and sets of missing
             keys for those locales as values.
+            If `sources` is `True`, the values are instead dictionaries with
+            the missing keys and the sorted list of files where each one is
+            defined.
 
         """
         if not self.translations:
             self.load_translations(*locales)
         if not locales:
             locales = self.translations.keys()
-        locales = [utils.locale_to_str(locale) for locale in locales]
+        strlocales = [utils.locale_to_str(locale) for locale in locales]
 
-        all_keys = []
-        keys = {}
-        for strlocale in locales:
-            trans_keys = utils._flatten(self.translations.get(strlocale)).keys()
-            keys[strlocale] = set(trans_keys)
-            all_keys.extend(trans_keys)
+        for strlocale in set(self._locale_keys).difference(self.translations):
+            del self._locale_keys[strlocale]
+        keys = {strlocale: self._get_locale_keys(strlocale) for strlocale in strlocales}
 
-        all_keys = set(all_keys)
+        all_keys = frozenset().union(*keys.values())
         missing_keys = {}
-        for key, value in keys.items():
-            missing = all_keys - value
-            if missing:
-                missing_keys[key] = missing
+        for strlocale, locale_keys in keys.items():
+            # `locale_keys` is a subset of `all_keys`
+            if len(locale_keys) < len(all_keys):
+                missing_keys[strlocale] = all_keys - locale_keys
 
+        if sources:
+            return self._get_missing_sources(missing_keys, strlocales)
         return missing_keys
 
+    def _get_locale_keys(self, strlocale):
+        """Return a frozenset with the flattened keys of the translations of
+        a locale, reusing the cached one unless its translations dictionary
+        has been replaced.
+        """
+        trans = self.translations.get(strlocale) or {}
+        cached = self._locale_keys.get(strlocale)
+        if cached is not None and cached[0] is trans:
+            return cached[1]
+        keys = _get_leaf_keys(trans)
+        self._locale_keys[strlocale] = (trans, keys)
+        return keys
+
+    def _get_missing_sources(self, missing_keys, strlocales):
+        """Map each of the missing keys to the files where it is defined
+        for any of the `strlocales`.
+        """
+        wanted = set(strlocales)
+        # Only the data the loaded translations were built from is used,
+        # so the sources always match the missing keys.
+        files_data = self.reader.get_loaded_files_data()
+        defined_in = {}
+        for filepath, data in files_data.items():
+            for strlocale, trans in data:
+                if strlocale not in wanted:
+                    continue
+                for key in _get_leaf_keys(trans):
+                    defined_in.setdefault(key, set()).add(filepath)
+
+        result = {}
+        for strlocale, keys in missing_keys.items():
+            result[strlocale] = {
+                key: sorted(defined_in.get(key, ())) for key in keys
+            }
+        return result
+
+
+class BoundTranslator(object):
+
+    """Translation and formatting functions bound to a single locale.
+    Get one with :meth:`I18n.for_locale`.
+
+    Calling the instance is a shortcut to calling ``self.translate``.
+
+    """
+
+    __slots__ = ("manager", "locale", "_key_index", "_formatters")
+
+    def __init__(self, manager, locale, key_index):
+        set_ = super(BoundTranslator, self).__setattr__
+        set_("manager", manager)
+        set_("locale", locale)
+        set_("_key_index", key_index)
+        set_("_formatters", {})
+
+    def __setattr__(self, name, value):
+        raise AttributeError("{} objects are read-only".format(self.__class__.__name__))
+
+    def __repr__(self):
+        return "{cname}({locale})".format(
+            cname=self.__class__.__name__, locale=self.locale
+        )
+
+    def __call__(self, *args, **kwargs):
+        return self.translate(*args, **kwargs)
+
+    def __getattr__(self, name):
+        """The `format*` methods of the manager, with the locale already set.
+        """
+        if not name.startswith("format"):
+            raise AttributeError(name)
+        formatter = self._formatters.get(name)
+        if formatter is None:
+            formatter = partial(getattr(self.manager, name), locale=self.locale)
+            self._formatters[name] = formatter
+        return formatter
+
+    def translate(self, key, count=None, **kwargs):
+        """Like :meth:`I18n.translate` but using the bound locale.
+        """
+        key = str(key)
+        return self.manager._render(
+            key, self._key_index.get(key), count, self.locale, kwargs
+        )
+
+    def translate_many(self, keys, count=None, **kwargs):
+        """Like :meth:`I18n.translate_many` but using the bound locale.
+        """
+        return _render_many(
+            self.manager._render, self._key_index, keys, count, self.locale, kwargs
+        )
+
+    def pluralize(self, dic, count):
+        """Like :func:`pluralize` but using the bound locale.
+        """
+        return pluralize(dic, count, self.locale)
+
+
+def _render_many(render, index, keys, count, locale, kwargs):
+    result = {}
+    for key in keys:
+        key = str(key)
+        result[key] = render(key, index.get(key), count, locale, kwargs)
+    return result
+
+
+class Message(object):
+
+    """A translation string parsed once and ready to be formatted.
+
+    Strings without placeholders are returned as they are, without calling
+    `str.format` at all.
+
+    :param source: the translation string.
+
+    """
+
+    __slots__ = ("source", "fields", "_text", "_positional")
+
+    def __init__(self, source):
+        self.source = source
+        self.fields = frozenset()
+        self._text = None
+        self._positional = False
+        try:
+            parsed = list(Formatter().parse(source))
+        except ValueError:
+            # Malformed, let `str.format` raise the error when used.
+            return
+
+        fields = set()
+        for _, name, _, _ in parsed:
+            if name is None:
+                continue
+            name = name.split(".", 1)[0].split("[", 1)[0]
+            if not name or name.isdigit():
+                self._positional = True
+            fields.add(name)
+        self.fields = frozenset(fields)
+        if not fields:
+            self._text = "".join(literal for literal, _, _, _ in parsed)
+
+    def __repr__(self):
+        return "{cname}({source!r})".format(
+            cname=self.__class__.__name__, source=self.source
+        )
+
+    def missing(self, kwargs):
+        """Return the set of placeholder names not in `kwargs`.
+        """
+        return self.fields.difference(kwargs)
+
+    def format(self, kwargs):
+        """Return the string formatted using the `kwargs` dictionary.
+        Like `str.format`, raises a `KeyError` if a placeholder is missing.
+        """
+        if self._text is not None:
+            return self._text
+        if self._positional:
+            return self.source.format(**kwargs)
+        return self.source.format_map(kwargs)
+
+
+def _build_key_index(translations):
+    """Build a flat dictionary with dotted keys from a list of nested
+    translation dictionaries. The values of the later ones overwrite those
+    of the former.
+
+    Every level is indexed, not only the leaves, so a key like `apple` can
+    still return the dictionary used for pluralization.
+
+    >> _build_key_index([{'a': {'b': 1, 'c': 2}}, {'a': {'b': 3}}])
+    {'a': {'b': 3}, 'a.b': 3, 'a.c': 2}
+
+    """
+    index = {}
+    for trans in translations:
+        stack = [("", trans)]
+        while stack:
+            prefix, dic = stack.pop()
+            for key, value in dic.items():
+                if value is None or not isinstance(key, str):
+                    continue
+                key = prefix + key
+                index[key] = value
+                if isinstance(value, dict):
+                    stack.append((key + ".", value))
+    return index
+
+
+def _get_leaf_keys(dic):
+    """Return a frozenset with the dotted keys of the leaves of a nested
+    dictionary.
+
+    >> sorted(_get_leaf_keys({'a': {'b': 1, 0: 2}, 'c': 3}))
+    ['a.0', 'a.b', 'c']
+
+    """
+    return frozenset(key for key, _ in utils._iter_flatten(dic))
+
 
 def pluralize(dic, count, locale=utils.DEFAULT_LOCALE):
     """Takes a dictionary and a number and return the value whose key in
@@ -279,7 +802,82 @@ def pluralize(dic, count, locale=utils.DEFAULT_LOCALE):
         if plural is not None:
             return plural
 
-    if isinstance(locale, str):
-        locale = Locale(locale)
-    literal = locale.plural_form(count)
+    literal = get_plural_form(locale, count)
     return dic.get(literal, dic.get("many", ""))
+
+
+def pluralize_many(dic, counts, locale=utils.DEFAULT_LOCALE, table_size=None):
+    """Like :func:`pluralize` but for a sequence of numbers (or a NumPy
+    array of integers), returning a list with the value for each one.
+
+    The locale and its plural rules are resolved only once and every
+    distinct number is pluralized only once.
+
+    :param table_size: size of the precomputed table of plural categories
+        to use (by default, ``PLURAL_TABLE_SIZE``). See :func:`get_plural_table`.
+
+    >> pluralize_many({'one': 'One apple', 'other': '{count} apples'}, [1, 2, 1])
+    ['One apple', '{count} apples', 'One apple']
+
+    """
+    if hasattr(counts, "tolist"):
+        counts = counts.tolist()
+    table = get_plural_table(locale, size=table_size)
+    size = len(table)
+    zero = dic.get("zero")
+    many = dic.get("many", "")
+
+    done = {}
+    result = []
+    for count in counts:
+        count = int(count or 0)
+        plural = done.get(count)
+        if plural is None:
+            plural = dic.get(count, dic.get(str(count)))
+            if plural is None and count == 0:
+                plural = zero
+            if plural is None:
+                if 0 <= count < size:
+                    literal = table[count]
+                else:
+                    literal = _get_plural_locale(locale).plural_form(count)
+                plural = dic.get(literal, many)
+            done[count] = plural
+        result.append(plural)
+    return result
+
+
+def get_plural_form(locale, count, table_size=None):
+    """Return the CLDR plural category ("zero", "one", "two", "few", "many"
+    or "other") of an integer for a locale.
+
+    Non-negative numbers lower than `table_size` (by default,
+    ``PLURAL_TABLE_SIZE``) are read from a precomputed table. Use a
+    `table_size` of 0 to not build one.
+    """
+    table = get_plural_table(locale, size=table_size)
+    if 0 <= count < len(table):
+        return table[count]
+    return _get_plural_locale(locale).plural_form(count)
+
+
+def get_plural_table(locale, size=None):
+    """Return a tuple with the plural category of every integer from 0 to
+    ``size - 1`` (by default, ``PLURAL_TABLE_SIZE``) for a locale.
+    The tables are built the first time are requested.
+    """
+    if size is None:
+        size = PLURAL_TABLE_SIZE
+    return _get_plural_table(utils.locale_to_str(locale), size)
+
+
+@lru_cache(maxsize=64)
+def _get_plural_table(strlocale, size):
+    plural_form = _get_plural_locale(strlocale).plural_form
+    return tuple(plural_form(count) for count in range(size))
+
+
+def _get_plural_locale(locale):
+    if isinstance(locale, Locale):
+        return locale
+    return utils.normalize_locale(locale) or Locale(locale)
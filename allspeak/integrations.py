@@ -1,30 +1,80 @@
+from functools import lru_cache
+
 from .utils import locale_to_str
 
 
 __all__ = [
+    "parse_accept_language",
     "get_werkzeug_preferred_locales",
     "get_webob_preferred_locales",
     "get_django_preferred_locales",
 ]
 
+ACCEPT_LANGUAGE_CACHE_SIZE = 512
+
+
+@lru_cache(maxsize=ACCEPT_LANGUAGE_CACHE_SIZE)
+def parse_accept_language(header):
+    """Parse the value of an `Accept-Language` header and return a tuple
+    of locales (as strings), sorted by their quality value, from higher
+    to lower. Locales with the same quality keep their original order.
+
+    Wildcards and locales with a quality of zero or an invalid one are
+    ignored.
+
+    The results are cached, since only a handful of distinct headers
+    account for almost all the requests.
+
+    >> parse_accept_language('es-PE, en;q=0.5, es;q=0.8, *;q=0.1')
+    ('es_PE', 'es', 'en')
+
+    """
+    languages = []
+    for position, item in enumerate(header.split(",")):
+        parts = item.split(";")
+        language = parts[0].strip()
+        if not language or language == "*":
+            continue
+        quality = 1.0
+        for param in parts[1:]:
+            name, _, value = param.partition("=")
+            if name.strip().lower() == "q":
+                try:
+                    quality = float(value.strip())
+                except ValueError:
+                    quality = 0
+        if not 0 < quality <= 1:
+            continue
+        languages.append((-quality, position, locale_to_str(language)))
+
+    result = []
+    seen = set()
+    for _, _, locale in sorted(languages):
+        if locale not in seen:
+            seen.add(locale)
+            result.append(locale)
+    return tuple(result)
+
+
+def _get_preferred_locales(headers):
+    header = headers.get("Accept-Language") if headers is not None else None
+    if header:
+        return list(parse_accept_language(header))
+
 
 def get_werkzeug_preferred_locales(request):
     """Return a list of preferred languages from a `werkzeug.wrappers.Request`
     instance.
 
     """
-    languages = getattr(request, "accept_languages", None)
-    if languages:
-        return [locale_to_str(l) for l in languages.values()]
+    return _get_preferred_locales(getattr(request, "headers", None))
 
 
 def get_webob_preferred_locales(request):
     """Return a list of preferred languages from a `webob.Request` instance.
 
     """
-    languages = getattr(request, "accept_language", None)
-    if languages:
-        return [locale_to_str(l) for l in languages]
+    return _get_preferred_locales(getattr(request, "headers", None))
 
 
 def get_django_preferred_locales(request):
@@ -35,6 +85,4 @@ def get_django_preferred_locales(request):
     meta = getattr(request, "META", None) or {}
     header = meta.get("HTTP_ACCEPT_LANGUAGE")
     if header:
-        languages = [l.strip().split(";")[::-1] for l in header.split(",")]
-        languages = sorted(languages)[::-1]
-        return [locale_to_str(l[1]) for l in languages]
+        return list(parse_accept_language(header))
@@ -1,4 +1,5 @@
 import datetime as dt
+from copy import copy
 from decimal import Decimal
 
 from babel import dates, numbers
@@ -8,6 +9,9 @@ from . import utils
 from .request_manager import RequestManager
 
 
+NAMED_FORMATS = ("short", "medium", "long", "full")
+
+
 class L10n(RequestManager):
     """Localization functions.
 
@@ -29,6 +33,7 @@ class L10n(RequestManager):
     DEFAULT_DATE_FORMATS = {"time": "medium", "date": "medium", "datetime": "medium"}
 
     def __init__(self, date_formats=None, **kwargs):
+        self._number_patterns = {}
         self.set_date_formats(date_formats)
         super(L10n, self).__init__(**kwargs)
 
@@ -48,6 +53,13 @@ class L10n(RequestManager):
         self.date_formats = self.DEFAULT_DATE_FORMATS.copy()
         if date_formats:
             self.date_formats.update(date_formats)
+        self._date_patterns = {}
+
+    def clear_format_cache(self):
+        """Empty the caches of parsed date and number patterns.
+        """
+        self._date_patterns = {}
+        self._number_patterns = {}
 
     def to_user_timezone(self, datetime, tzinfo=None):
         """Convert a datetime object to the user's timezone.  This
@@ -85,17 +97,61 @@ class L10n(RequestManager):
                 format = rv
         return format
 
+    def _get_date_pattern(self, kind, format, locale):
+        """Return the parsed pattern for that kind of value ("date", "time"
+        or "datetime"), format and locale.
+
+        The patterns are cached, so the CLDR data of the locale is looked up
+        and the pattern parsed only the first time.
+        """
+        key = (str(locale), kind, format)
+        pattern = self._date_patterns.get(key)
+        if pattern is None:
+            pattern = _parse_date_pattern(kind, format, locale)
+            self._date_patterns[key] = pattern
+        return pattern
+
+    def _get_number_pattern(
+        self,
+        kind,
+        format,
+        locale,
+        currency=None,
+        currency_digits=True,
+        format_type="standard",
+    ):
+        """Return the parsed number pattern for that kind of number
+        ("decimal", "currency", "percent" or "scientific"), format and locale.
+
+        The patterns are cached. For currencies, the cached pattern already
+        includes the symbol and the number of digits of the currency.
+        """
+        key = (str(locale), kind, format, currency, currency_digits, format_type)
+        pattern = self._number_patterns.get(key)
+        if pattern is None:
+            pattern = _parse_number_pattern(kind, format, locale, format_type)
+            if currency:
+                pattern = _bind_currency(pattern, currency, currency_digits, locale)
+            self._number_patterns[key] = pattern
+        return pattern
+
     def _date_format(
-        self, formatter, obj, format, rebase, locale=None, tzinfo=None, **extra
+        self, kind, obj, format, rebase, locale=None, tzinfo=None, **extra
     ):
         if obj == "now":
             obj = dt.datetime.utcnow()
         locale = utils.normalize_locale(locale) or self.get_locale()
+        pattern = self._get_date_pattern(kind, format, locale)
         extra = {}
-        if formatter is not dates.format_date and rebase:
+        if kind != "date" and rebase:
             tzinfo = tzinfo or self.get_timezone()
             extra["tzinfo"] = utils.normalize_timezone(tzinfo)
-        return formatter(obj, format, locale=locale, **extra)
+
+        if isinstance(pattern, DateTimeFormat):
+            obj = _ensure_datetime_tzinfo(_get_datetime(obj), extra.get("tzinfo"))
+            return pattern.apply(obj, locale)
+
+        return DATE_FORMATTERS[kind](obj, pattern, locale=locale, **extra)
 
     def format(self, value, *args, **kwargs):
         """Return a formatted `value` according to the detected type and
@@ -161,7 +217,7 @@ class L10n(RequestManager):
         """
         format = self._get_format("datetime", format)
         return self._date_format(
-            dates.format_datetime,
+            "datetime",
             datetime,
             format,
             rebase,
@@ -195,7 +251,7 @@ class L10n(RequestManager):
             date = self.to_user_timezone(date, tzinfo=tzinfo)
         format = self._get_format("date", format)
         return self._date_format(
-            dates.format_date,
+            "date",
             date,
             format,
             rebase,
@@ -204,6 +260,58 @@ class L10n(RequestManager):
             **kwargs
         )
 
+    def format_datetime_many(
+        self, values, format=None, rebase=True, locale=None, tzinfo=None
+    ):
+        """Like `format_datetime` but for a sequence of datetimes (or a NumPy
+        `datetime64` array), returning a generator of the formatted values.
+
+        The locale, the timezone and the pattern are resolved only once.
+        Empty values are formatted as empty strings.
+
+        :param values: an iterable of `datetime.datetime` objects, or of any
+            other value accepted by `format_datetime`.
+        :param format: see `format_datetime`.
+        :param rebase: Convert the datetimes to the users's timezone.
+        :param locale: Overwrite the global locale.
+        :param tzinfo: Overwrite the global timezone.
+
+        """
+        format = self._get_format("datetime", format)
+        locale = utils.normalize_locale(locale) or self.get_locale()
+        pattern = self._get_date_pattern("datetime", format, locale)
+        tzinfo = self._get_rebase_timezone(rebase, tzinfo)
+        return _format_datetimes(pattern, values, locale, tzinfo)
+
+    def format_date_many(
+        self, values, format=None, rebase=True, locale=None, tzinfo=None
+    ):
+        """Like `format_date` but for a sequence of dates or datetimes (or a
+        NumPy `datetime64` array), returning a generator of the formatted
+        values.
+
+        The locale, the timezone and the pattern are resolved only once.
+        Empty values are formatted as empty strings.
+
+        :param values: an iterable of `datetime.datetime` or `datetime.date`
+            objects.
+        :param format: see `format_date`.
+        :param rebase: Convert the datetimes to the users's timezone.
+        :param locale: Overwrite the global locale.
+        :param tzinfo: Overwrite the global timezone.
+
+        """
+        format = self._get_format("date", format)
+        locale = utils.normalize_locale(locale) or self.get_locale()
+        pattern = self._get_date_pattern("date", format, locale)
+        tzinfo = self._get_rebase_timezone(rebase, tzinfo)
+        return _format_dates(pattern, values, locale, tzinfo)
+
+    def _get_rebase_timezone(self, rebase, tzinfo):
+        if not rebase:
+            return None
+        return utils.normalize_timezone(tzinfo or self.get_timezone())
+
     def format_time(
         self, time=None, format=None, rebase=True, locale=None, tzinfo=None, **kwargs
     ):
@@ -227,7 +335,7 @@ class L10n(RequestManager):
         """
         format = self._get_format("time", format)
         return self._date_format(
-            dates.format_time,
+            "time",
             time,
             format,
             rebase,
@@ -306,7 +414,23 @@ class L10n(RequestManager):
         if number in ("", None):
             return ""
         locale = utils.normalize_locale(locale) or self.get_locale()
-        return numbers.format_decimal(number, format=format, locale=locale, **kwargs)
+        pattern = self._get_number_pattern("decimal", format, locale)
+        return pattern.apply(number, locale, **kwargs)
+
+    def format_decimal_many(self, values, format=None, locale=None, **kwargs):
+        """Like `format_decimal` but for a sequence of numbers (or a NumPy
+        array), returning a list with the formatted value of each one.
+
+        The locale and the pattern are resolved only once.
+
+        :param values: an iterable of numbers to format.
+        :param format: see `format_decimal`.
+        :param locale: Overwrite the global locale.
+
+        """
+        locale = utils.normalize_locale(locale) or self.get_locale()
+        pattern = self._get_number_pattern("decimal", format, locale)
+        return _apply_many(pattern, values, locale, kwargs)
 
     def format_currency(self, number, currency, format=None, locale=None, **kwargs):
         """Return the given number formatted for the locale in the
@@ -323,10 +447,56 @@ class L10n(RequestManager):
         if number in ("", None):
             return ""
         locale = utils.normalize_locale(locale) or self.get_locale()
-        return numbers.format_currency(
-            number, currency, format=format, locale=locale, **kwargs
+        if kwargs.get("format_type") == "name":
+            return numbers.format_currency(
+                number, currency, format=format, locale=locale, **kwargs
+            )
+        pattern = self._get_number_pattern(
+            "currency",
+            format,
+            locale,
+            currency=currency,
+            currency_digits=kwargs.pop("currency_digits", True),
+            format_type=kwargs.pop("format_type", "standard"),
+        )
+        # The currency symbol and digits are already in the pattern
+        return pattern.apply(
+            number, locale, currency=currency, currency_digits=False, **kwargs
         )
 
+    def format_currency_many(
+        self, values, currency, format=None, locale=None, **kwargs
+    ):
+        """Like `format_currency` but for a sequence of numbers (or a NumPy
+        array), returning a list with the formatted value of each one.
+
+        The locale, the pattern and the currency symbol are resolved only once.
+
+        :param values: an iterable of numbers to format.
+        :param currency: the currency code
+        :param format: see `format_currency`.
+        :param locale: Overwrite the global locale.
+
+        """
+        if kwargs.get("format_type") == "name":
+            return [
+                self.format_currency(
+                    value, currency, format=format, locale=locale, **kwargs
+                )
+                for value in _to_list(values)
+            ]
+        locale = utils.normalize_locale(locale) or self.get_locale()
+        pattern = self._get_number_pattern(
+            "currency",
+            format,
+            locale,
+            currency=currency,
+            currency_digits=kwargs.pop("currency_digits", True),
+            format_type=kwargs.pop("format_type", "standard"),
+        )
+        kwargs.update(currency=currency, currency_digits=False)
+        return _apply_many(pattern, values, locale, kwargs)
+
     def format_percent(self, number, format=None, locale=None, **kwargs):
         """Return a percent value formatted for the locale in the
         current request.
@@ -340,7 +510,23 @@ class L10n(RequestManager):
         if number in ("", None):
             return ""
         locale = utils.normalize_locale(locale) or self.get_locale()
-        return numbers.format_percent(number, format=format, locale=locale, **kwargs)
+        pattern = self._get_number_pattern("percent", format, locale)
+        return pattern.apply(number, locale, **kwargs)
+
+    def format_percent_many(self, values, format=None, locale=None, **kwargs):
+        """Like `format_percent` but for a sequence of numbers (or a NumPy
+        array), returning a list with the formatted value of each one.
+
+        The locale and the pattern are resolved only once.
+
+        :param values: an iterable of numbers to format.
+        :param format: see `format_percent`.
+        :param locale: Overwrite the global locale.
+
+        """
+        locale = utils.normalize_locale(locale) or self.get_locale()
+        pattern = self._get_number_pattern("percent", format, locale)
+        return _apply_many(pattern, values, locale, kwargs)
 
     def format_scientific(self, number, format=None, locale=None, **kwargs):
         """Return value formatted in scientific notation for the locale in
@@ -355,4 +541,160 @@ class L10n(RequestManager):
         if number in ("", None):
             return ""
         locale = utils.normalize_locale(locale) or self.get_locale()
-        return numbers.format_scientific(number, format=format, locale=locale, **kwargs)
+        pattern = self._get_number_pattern("scientific", format, locale)
+        return pattern.apply(number, locale, **kwargs)
+
+
+DATE_FORMATTERS = {
+    "date": dates.format_date,
+    "time": dates.format_time,
+    "datetime": dates.format_datetime,
+}
+
+
+class DateTimeFormat(object):
+    """A named datetime format of a locale, eg: `"{1}, {0}"`, where `{0}` is
+    replaced by the time, formatted with the time pattern of the same name,
+    and `{1}` by the date, formatted with the date pattern.
+    """
+
+    __slots__ = ("format", "date_pattern", "time_pattern")
+
+    def __init__(self, format, date_pattern, time_pattern):
+        self.format = format
+        self.date_pattern = date_pattern
+        self.time_pattern = time_pattern
+
+    def apply(self, datetime, locale):
+        """Format an aware datetime, already in the right timezone.
+        """
+        time = dates.format_time(datetime, self.time_pattern, locale=locale)
+        date = dates.format_date(datetime, self.date_pattern, locale=locale)
+        return self.format.replace("{0}", time).replace("{1}", date)
+
+
+def _get_datetime(instant):
+    """Return a `datetime.datetime` from any of the values accepted by
+    `babel.dates.format_datetime`: `None` (now), a timestamp, a `time`
+    (today at that time), a `date` (at midnight) or a `datetime`.
+    """
+    if instant is None:
+        return dt.datetime.utcnow()
+    if isinstance(instant, (int, float)):
+        return dt.datetime.utcfromtimestamp(instant)
+    if isinstance(instant, dt.time):
+        return dt.datetime.combine(dt.date.today(), instant)
+    if isinstance(instant, dt.date) and not isinstance(instant, dt.datetime):
+        return dt.datetime.combine(instant, dt.time())
+    return instant
+
+
+def _ensure_datetime_tzinfo(datetime, tzinfo=None):
+    """Make the datetime aware, assuming it's in UTC if it's naive, and
+    convert it to the `tzinfo` timezone, if given.
+    """
+    if datetime.tzinfo is None:
+        datetime = datetime.replace(tzinfo=UTC)
+    if tzinfo is not None:
+        datetime = datetime.astimezone(tzinfo)
+        if hasattr(tzinfo, "normalize"):  # pytz
+            datetime = tzinfo.normalize(datetime)
+    return datetime
+
+
+def _parse_date_pattern(kind, format, locale):
+    if format not in NAMED_FORMATS:
+        return dates.parse_pattern(format)
+    if kind == "date":
+        return dates.get_date_format(format, locale=locale)
+    if kind == "time":
+        return dates.get_time_format(format, locale=locale)
+    return DateTimeFormat(
+        dates.get_datetime_format(format, locale=locale).replace("'", ""),
+        dates.get_date_format(format, locale=locale),
+        dates.get_time_format(format, locale=locale),
+    )
+
+
+def _to_list(values):
+    # NumPy arrays are converted to a list of Python numbers at once,
+    # which is much faster than iterating over them.
+    if hasattr(values, "tolist"):
+        return values.tolist()
+    return values
+
+
+def _to_datetimes(values):
+    dtype = getattr(values, "dtype", None)
+    # `tolist()` returns dates for these units but integers for the
+    # units smaller than a microsecond, so those are converted first.
+    if dtype is not None and dtype.kind == "M":
+        if not dtype.str.endswith(("[Y]", "[M]", "[W]", "[D]")):
+            values = values.astype("datetime64[us]")
+    return _to_list(values)
+
+
+def _format_datetimes(pattern, values, locale, tzinfo):
+    apply = pattern.apply
+    for value in _to_datetimes(values):
+        if value in ("", None):
+            yield ""
+            continue
+        value = _ensure_datetime_tzinfo(_get_datetime(value), tzinfo)
+        yield apply(value, locale)
+
+
+def _format_dates(pattern, values, locale, tzinfo):
+    apply = pattern.apply
+    for value in _to_datetimes(values):
+        if value in ("", None):
+            yield ""
+            continue
+        if isinstance(value, dt.datetime):
+            if tzinfo is not None:
+                value = _ensure_datetime_tzinfo(value, tzinfo)
+            value = value.date()
+        yield apply(value, locale)
+
+
+def _apply_many(pattern, values, locale, kwargs):
+    apply = pattern.apply
+    return [
+        "" if value in ("", None) else apply(value, locale, **kwargs)
+        for value in _to_list(values)
+    ]
+
+
+def _parse_number_pattern(kind, format, locale, format_type):
+    if format:
+        return numbers.parse_pattern(format)
+    if kind == "currency":
+        try:
+            return locale.currency_formats[format_type]
+        except KeyError:
+            raise numbers.UnknownCurrencyFormatError(
+                "%r is not a known currency format type" % format_type
+            )
+    return getattr(locale, kind + "_formats").get(None)
+
+
+def _bind_currency(pattern, currency, currency_digits, locale):
+    """Return a copy of the number pattern with the symbol and code of the
+    currency already in its prefixes and suffixes and, if `currency_digits`
+    is true, using the currency's precision.
+    """
+    pattern = copy(pattern)
+    if currency_digits:
+        pattern.frac_prec = (numbers.get_currency_precision(currency),) * 2
+
+    # The long name of the currency depends on the value, so is left for
+    # `NumberPattern.apply` to do.
+    if u"¤¤¤" not in "".join(pattern.prefix + pattern.suffix):
+        symbol = numbers.get_currency_symbol(currency, locale)
+
+        def bind(affix):
+            return affix.replace(u"¤¤", currency.upper()).replace(u"¤", symbol)
+
+        pattern.prefix = tuple(bind(affix) for affix in pattern.prefix)
+        pattern.suffix = tuple(bind(affix) for affix in pattern.suffix)
+    return pattern
@@ -1,31 +1,209 @@
-import collections
 import fnmatch
 import io
+import json
+import logging
 import os
+import pickle
+import re
+import threading
+from collections.abc import Mapping
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
 from os.path import join, dirname, realpath, abspath, normpath, isdir, splitext
 
 import poyo
 
+try:
+    import yaml as pyyaml
+    from yaml import CSafeLoader
+except ImportError:  # pragma:no cover
+    pyyaml = None
+
 from .utils import LOCALES_FOLDER, split_locale, _is_sequence
 
 
-def get_strict_yaml_data(filepath):
+SNAPSHOT_VERSION = 1
+
+YAML_BACKENDS = ("auto", "pyyaml", "poyo")
+
+logger = logging.getLogger(__name__)
+
+
+class NotPoyoCompatible(Exception):
+
+    """Raised by `PoyoCompatibleLoader` when a document has something that
+    PyYAML reads differently than `poyo`, so it must be parsed by `poyo`.
+    """
+
+
+if pyyaml:
+
+    class PoyoCompatibleLoader(CSafeLoader):
+
+        """A PyYAML loader, using the libyaml C parser, that reads the
+        documents like `poyo` does: only `null`, `true`, `false`, integers
+        and floats are recognized, everything else is a string; the quotes
+        around a string are removed but its escape sequences are kept as
+        they are, and an empty value is an empty dictionary.
+
+        For anything else `poyo` reads differently (flow collections like
+        `{count}` or `[draft]`, anchors, aliases, tags, block or multi-line
+        strings, and values followed by spaces or comments)
+        `NotPoyoCompatible` is raised.
+        """
+
+        yaml_implicit_resolvers = {}
+
+        def __init__(self, stream):
+            super().__init__(stream)
+            self.source = stream
+
+        def construct_document(self, node):
+            _make_poyo_compatible(self.source, node)
+            return super().construct_document(node)
+
+        def construct_null(self, node):
+            return None
+
+        def construct_bool(self, node):
+            return self.construct_scalar(node).lower() == "true"
+
+        def construct_int(self, node):
+            return int(self.construct_scalar(node))
+
+        def construct_float(self, node):
+            return float(self.construct_scalar(node))
+
+    for tag, regexp in (
+        ("null", r"^(?:null|Null|NULL|~)$"),
+        ("bool", r"^(?:true|True|TRUE|false|False|FALSE)$"),
+        ("int", r"^[-+]?[0-9]+$"),
+        ("float", r"^[-+]?(?:\.[0-9]+|[0-9]+(?:\.[0-9]*)?)(?:[eE][-+]?[0-9]+)?$"),
+    ):
+        tag = "tag:yaml.org,2002:" + tag
+        PoyoCompatibleLoader.add_implicit_resolver(tag, re.compile(regexp), None)
+        PoyoCompatibleLoader.add_constructor(
+            tag, getattr(PoyoCompatibleLoader, "construct_" + tag.rsplit(":", 1)[1])
+        )
+
+
+def _make_poyo_compatible(source, root):
+    """Check the nodes of a document parsed by PyYAML, before building it,
+    and update the ones `poyo` reads differently.
+    Raise `NotPoyoCompatible` if that's not possible.
+    """
+    stack = [root]
+    while stack:
+        node = stack.pop()
+        if isinstance(node, pyyaml.ScalarNode):
+            _check_scalar(source, node)
+            continue
+        first = node.start_mark.index
+        if node.flow_style or source[first:first + 1] in ("&", "!"):
+            raise NotPoyoCompatible()
+        if isinstance(node, pyyaml.SequenceNode):
+            stack.extend(node.value)
+            continue
+        for i, (key, value) in enumerate(node.value):
+            if not isinstance(key, pyyaml.ScalarNode):
+                raise NotPoyoCompatible()
+            _check_scalar(source, key, is_key=True)
+            if isinstance(value, pyyaml.ScalarNode):
+                node.value[i] = (key, _check_scalar(source, value, is_value=True))
+            else:
+                stack.append(value)
+
+
+def _check_scalar(source, node, is_key=False, is_value=False):
+    start, end = node.start_mark.index, node.end_mark.index
+    raw = source[start:end]
+    if is_key:
+        if source[end:end + 1] != ":":
+            raise NotPoyoCompatible()
+    else:
+        eol = source.find("\n", end)
+        # `poyo` keeps the spaces (and comments) after the value
+        if source[end:eol if eol >= 0 else None]:
+            raise NotPoyoCompatible()
+
+    if node.style in ("'", '"'):
+        if "\n" in raw:
+            raise NotPoyoCompatible()
+        node.value = raw[1:-1]
+        return node
+    # Block styles, anchors, aliases, tags or multi-line strings
+    if node.style or raw != node.value:
+        raise NotPoyoCompatible()
+    if not raw:
+        if not is_value:
+            raise NotPoyoCompatible()
+        return pyyaml.MappingNode(
+            "tag:yaml.org,2002:map", [], node.start_mark, node.end_mark
+        )
+    return node
+
+
+def get_strict_yaml_data(filepath, backend="auto"):
     """Parse a yaml locale file.
     """
     with io.open(filepath, mode="r", encoding="utf8") as f:
-        return parse_yaml(f.read())
+        return parse_yaml(f.read(), backend=backend)
 
 
-def parse_yaml(yaml):
+def get_json_data(filepath):
+    """Parse a json locale file.
+    To use it, register it with ``reader.register_loader("json", get_json_data)``.
+    """
+    with io.open(filepath, mode="r", encoding="utf8") as f:
+        return json.load(f)
+
+
+def parse_yaml(yaml, backend="auto"):
+    """Parse a yaml string.
+
+    :param backend: `"poyo"`, `"pyyaml"` or `"auto"`.
+        With `"auto"` (the default), PyYAML is used, if installed with
+        the libyaml bindings, since it's much faster. If it can't parse
+        the string, or PyYAML isn't available, `poyo` is used instead.
+        In both cases, the values are read like `poyo` does, and the
+        documents with something PyYAML can't read that way (like flow
+        collections, eg: `n: {count}`, or anchors) are parsed by `poyo`.
+    """
+    assert backend in YAML_BACKENDS, "Unknown yaml backend `{}`".format(backend)
+    if backend != "poyo":
+        assert pyyaml or backend == "auto", "PyYAML with libyaml is not installed"
+        if pyyaml:
+            try:
+                return pyyaml.load(yaml, Loader=PoyoCompatibleLoader) or {}
+            except NotPoyoCompatible:
+                pass
+            except pyyaml.YAMLError:
+                if backend == "pyyaml":
+                    raise
     return poyo.parse_string(yaml)
 
 
+def scan_yaml_locales(filepath):
+    """Return the first-level keys (the locales) of a yaml locale file
+    without parsing the rest of it.
+    """
+    keys = []
+    with io.open(filepath, mode="r", encoding="utf8") as f:
+        for line in f:
+            if not line.strip() or line[0] in " \t#" or ":" not in line:
+                continue
+            key = line.split(":", 1)[0].strip().strip("'\"")
+            if key:
+                keys.append(key)
+    return keys
+
+
 def deep_update(source, overrides):
     """Update a nested dictionary or similar mapping.
     Modify ``source`` in place.
     """
     for key, value in overrides.items():
-        if isinstance(value, collections.Mapping) and value:
+        if isinstance(value, Mapping) and value:
             returned = deep_update(source.get(key, {}), value)
             source[key] = returned
         else:
@@ -33,6 +211,33 @@ def deep_update(source, overrides):
     return source
 
 
+def _call_loader(loader, filepath):
+    return loader(filepath)
+
+
+def _get_stat(filepath):
+    stat = os.stat(filepath)
+    return (stat.st_mtime_ns, stat.st_size)
+
+
+def _get_unchanged(cache, stats):
+    """Return the data in `cache` of the files whose stats haven't changed.
+    """
+    result = {}
+    for filepath, stat in stats.items():
+        cached = cache.get(filepath)
+        if cached and cached[0] == stat:
+            result[filepath] = cached[1]
+    return result
+
+
+def _remove(path):
+    try:
+        os.remove(path)
+    except OSError:
+        pass
+
+
 class Reader(object):
 
     """Functions related to loading and parsing translation files.
@@ -40,11 +245,50 @@ class Reader(object):
     :param folderpath: path or a list of paths (relative or absolute) that will
         be searched for the translations.
 
+    :param cache_path: optional path of a file where to store a snapshot of
+        the parsed translation files. When set, a file is only parsed again
+        if its modification time or size has changed since the snapshot was
+        written. The snapshot is read only once and then kept in memory.
+
+    :param processes: when set, parse the files concurrently using a pool
+        of that many processes. The registered loaders must be picklable
+        (eg. module-level functions) for this to work.
+        The results are merged in the same order as when parsing them one
+        after the other.
+
+    :param keep_files_data: keep in memory the parsed data of each file,
+        so when some of them change, the translations can be rebuilt
+        without parsing the others again.
+
+    :param yaml_backend: the parser used for the yaml files: `"poyo"`,
+        `"pyyaml"` or `"auto"` (PyYAML if available, falling back to poyo).
+        See :func:`parse_yaml`.
+
     """
 
-    def __init__(self, folderpath=LOCALES_FOLDER):
+    def __init__(
+        self,
+        folderpath=LOCALES_FOLDER,
+        cache_path=None,
+        processes=None,
+        keep_files_data=False,
+        yaml_backend="auto",
+    ):
+        assert yaml_backend in YAML_BACKENDS, (
+            "Unknown yaml backend `{}`".format(yaml_backend)
+        )
+        self.yaml_backend = yaml_backend
         self.folderpath = self._process_folderpath(folderpath)
+        self.cache_path = cache_path
+        self.processes = processes
+        self.keep_files_data = keep_files_data
         self._filepaths = {}
+        self._stats = {}
+        self._loaded_stats = {}
+        self._files_locales = {}
+        self._files_data = {}
+        self._snapshot = None
+        self.locales_index = None
         self._set_loaders()
 
     def __repr__(self):
@@ -57,7 +301,11 @@ class Reader(object):
     def _set_loaders(self):
         self.loaders = {}
         self.loaders_ext = []
-        self.register_loader("yml", get_strict_yaml_data)
+        self.scanners = {}
+        loader = get_strict_yaml_data
+        if self.yaml_backend != "auto":
+            loader = partial(get_strict_yaml_data, backend=self.yaml_backend)
+        self.register_loader("yml", loader, scanner=scan_yaml_locales)
 
     def _process_folderpath(self, folderpath):
         if not _is_sequence(folderpath):
@@ -70,14 +318,23 @@ class Reader(object):
             paths.append(path)
         return paths
 
-    def register_loader(self, ext, func):
+    def register_loader(self, ext, func, scanner=None):
         """Register a loader for a file extension.
         `func` must take a single argument with the full path of a
         locale file and return a dictionary with the data.
+
+        The optional `scanner` also takes the full path of a locale file,
+        but must return only the list of locales defined in it.
+        Without one, files with this extension are fully parsed to
+        find out which locales they have.
         """
         if ext not in self.loaders_ext:
             self.loaders_ext.append(ext)
         self.loaders[ext] = func
+        if scanner:
+            self.scanners[ext] = scanner
+        else:
+            self.scanners.pop(ext, None)
 
     def get_loader(self, filepath):
         """Get the file loader suitable for a specific file.
@@ -106,16 +363,265 @@ class Reader(object):
         data = loader(filepath)
         return self._extract_locales(data)
 
-    def _update_translations(self, translations, filepath):
+    def _get_file_locales(self, filepath):
+        """Return the list of locales defined in a locale file.
+        """
+        _, ext = splitext(filepath)
+        scanner = self.scanners.get(ext.strip("."))
+        if scanner:
+            return ["_".join(split_locale(locale)) for locale in scanner(filepath)]
+        return [locale for locale, _ in self._load_file(filepath)]
+
+    def index_locales(self, folderpath=None):
+        """Search for locale files on `folderpath` and return a dictionary
+        with the locales found as keys and the list of files where each
+        one is defined as values.
+
+        Unless a `folderpath` is given, the result is also stored as
+        ``self.locales_index`` and used by `load_translations` to only
+        load the files of the requested locales.
+        """
+        filepaths = self.find_files(folderpath)
+        for filepath in filepaths:
+            stat = _get_stat(filepath)
+            if self._stats.get(filepath) != stat or (
+                filepath not in self._files_locales
+            ):
+                self._files_locales[filepath] = self._get_file_locales(filepath)
+                self._stats[filepath] = stat
+
+        index = self._build_locales_index(filepaths)
+        if not folderpath:
+            self.locales_index = index
+        return index
+
+    def _build_locales_index(self, filepaths):
+        index = {}
+        for filepath in filepaths:
+            for locale in self._files_locales.get(filepath, ()):
+                files = index.setdefault(locale, [])
+                if filepath not in files:
+                    files.append(filepath)
+        return index
+
+    def find_changes(self):
+        """Check the locale files for changes since the last time they were
+        read, and return the set of locales defined in the files that were
+        modified, added or removed.
+        The locales index, if used, is updated.
+        """
+        changed = set()
+        filepaths = self.find_files()
+        for filepath in filepaths:
+            stat = _get_stat(filepath)
+            if self._stats.get(filepath) == stat:
+                continue
+            changed.update(self._files_locales.get(filepath, ()))
+            locales = self._get_file_locales(filepath)
+            changed.update(locales)
+            self._files_locales[filepath] = locales
+            self._stats[filepath] = stat
+
+        removed = set(self._stats).difference(filepaths)
+        for filepath in removed:
+            changed.update(self._files_locales.pop(filepath, ()))
+            del self._stats[filepath]
+            self._loaded_stats.pop(filepath, None)
+            self._files_data.pop(filepath, None)
+            self._filepaths.pop(filepath, None)
+
+        if changed and self.locales_index is not None:
+            self.locales_index = self._build_locales_index(filepaths)
+        return changed
+
+    def watch(self, callback, interval=1.0):
+        """Start a background thread that checks the locale files for
+        changes every `interval` seconds, and calls `callback` with
+        the set of affected locales whenever something has changed.
+
+        Return a `threading.Event`. Set it to stop watching.
+        """
+        stop = threading.Event()
+
+        def run():
+            while not stop.wait(interval):
+                try:
+                    changed = self.find_changes()
+                    if changed:
+                        callback(changed)
+                except Exception:
+                    # Eg. a file half-written by an editor. It will be
+                    # read again on its next change.
+                    logger.exception("Error reloading the translations")
+
+        thread = threading.Thread(target=run, name="allspeak-watcher")
+        thread.daemon = True
+        thread.start()
+        return stop
+
+    def _update_translations(self, translations, filepath, data=None, locales=None):
         """Update the `translations` dictionary with the translation data
         extracted from the file in `filepath`.
+        If a set of `locales` is given, the data of the others is ignored.
         """
         self._filepaths[filepath] = 1
-        data = self._load_file(filepath)
+        if data is None:
+            data = self._load_file(filepath)
         for locale, trans in data:
+            if locales is not None and locale not in locales:
+                continue
             translations.setdefault(locale, {})
             deep_update(translations[locale], trans)
 
+    def find_files(self, folderpath=None):
+        """Return the list of locale files in `folderpath` (or in the stored
+        locales folder or list of folders), in the order they are loaded.
+        """
+        if folderpath:
+            folderpath = self._process_folderpath(folderpath)
+        else:
+            folderpath = self.folderpath
+
+        filepaths = []
+        for path in folderpath:
+            for root, dirnames, filenames in os.walk(path):
+                for ext in self.loaders_ext:
+                    pattern = "*.{}".format(ext)
+                    for filename in fnmatch.filter(filenames, pattern):
+                        if filename.startswith("."):
+                            continue
+                        filepaths.append(join(root, filename))
+        return filepaths
+
+    def _load_files(self, filepaths, update=True):
+        """Return a dictionary with the parsed data of each file in
+        `filepaths`, using the data in memory (if `keep_files_data` is
+        enabled) or the snapshot for the files that haven't changed.
+
+        If `update` is false, the stats of the files, the snapshot and the
+        data in memory are left untouched.
+        """
+        stats = {filepath: _get_stat(filepath) for filepath in filepaths}
+        result = _get_unchanged(self._files_data, stats)
+        snapshot = {}
+        if len(result) < len(filepaths):
+            snapshot = self._read_snapshot()
+            result.update(_get_unchanged(snapshot, stats))
+
+        missing = [filepath for filepath in filepaths if filepath not in result]
+        result.update(zip(missing, self._parse_files(missing)))
+
+        if not update:
+            return result
+
+        if self.cache_path and missing:
+            files = {
+                filepath: cached
+                for filepath, cached in snapshot.items()
+                if filepath not in result and os.path.exists(filepath)
+            }
+            files.update(
+                (filepath, (stats[filepath], result[filepath])) for filepath in result
+            )
+            self._write_snapshot(files)
+
+        self._stats.update(stats)
+        for filepath in filepaths:
+            self._files_locales[filepath] = [locale for locale, _ in result[filepath]]
+        if self.keep_files_data:
+            self._files_data.update(
+                (filepath, (stats[filepath], result[filepath]))
+                for filepath in filepaths
+            )
+        return result
+
+    def get_files_data(self, folderpath=None):
+        """Return a dictionary with the locale files in `folderpath` (or in the
+        stored locales folders) as keys and, as values, lists of
+        ``(locale, translations)`` tuples with the data of each one.
+
+        Like when loading the translations, only the files that have changed
+        are parsed again if the data in memory or a snapshot can be used.
+        The files are not marked as read, so their changes are still
+        reported by `find_changes`.
+        """
+        return self._load_files(self.find_files(folderpath), update=False)
+
+    def get_loaded_files_data(self):
+        """Like `get_files_data` but only for the files the loaded
+        translations were read from and with the same data those translations
+        have: the files modified after they were loaded are left out.
+        """
+        loaded = {
+            filepath: self._loaded_stats[filepath]
+            for filepath in self._filepaths
+            if filepath in self._loaded_stats
+        }
+        result = _get_unchanged(self._files_data, loaded)
+        if len(result) < len(loaded):
+            result.update(_get_unchanged(self._read_snapshot(), loaded))
+        for filepath, stat in loaded.items():
+            if filepath in result or not os.path.exists(filepath):
+                continue
+            if _get_stat(filepath) == stat:
+                result[filepath] = self._load_file(filepath)
+        return result
+
+    def _parse_files(self, filepaths):
+        """Load and parse the locale files, in a pool of processes if
+        `self.processes` is set, and return their data in the same order.
+        """
+        if not self.processes or self.processes < 2 or len(filepaths) < 2:
+            return [self._load_file(filepath) for filepath in filepaths]
+
+        loaders = [self.get_loader(filepath) for filepath in filepaths]
+        workers = min(self.processes, len(filepaths))
+        chunksize = max(1, len(filepaths) // (workers * 4))
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            files_data = list(
+                executor.map(_call_loader, loaders, filepaths, chunksize=chunksize)
+            )
+        return [self._extract_locales(data) for data in files_data]
+
+    def _read_snapshot(self):
+        """Return the files data stored in the snapshot or an empty dictionary
+        if there isn't one or it can't be used.
+        """
+        if self._snapshot is None:
+            self._snapshot = self._load_snapshot()
+        return self._snapshot
+
+    def _load_snapshot(self):
+        if not self.cache_path or not os.path.exists(self.cache_path):
+            return {}
+        try:
+            with io.open(self.cache_path, mode="rb") as f:
+                snapshot = pickle.load(f)
+        except Exception:
+            # A corrupted or incompatible snapshot is just ignored.
+            return {}
+        if not isinstance(snapshot, dict) or (
+            snapshot.get("version") != SNAPSHOT_VERSION
+        ):
+            return {}
+        return snapshot.get("files") or {}
+
+    def _write_snapshot(self, files):
+        self._snapshot = files
+        snapshot = {"version": SNAPSHOT_VERSION, "files": files}
+        tmppath = "{}.{}.tmp".format(self.cache_path, os.getpid())
+        try:
+            with io.open(tmppath, mode="wb") as f:
+                pickle.dump(snapshot, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmppath, self.cache_path)
+        except OSError as error:
+            # The snapshot is just a cache, so the translations are still
+            # loaded without it.
+            logger.warning(
+                "Couldn't write the snapshot `%s`: %s", self.cache_path, error
+            )
+            _remove(tmppath)
+
     def load_translations(self, folderpath=None, locales=None):
         """Search for locale files on `folderpath`,
         load and parse them to build a big dictionary with all the
@@ -126,24 +632,39 @@ class Reader(object):
 
         :param folderpath: overwrite the stored locales folder or list of folders.
 
-        :param locales: does nothing, but might be useful to implement
-            load-on-demand in your own subclass.
+        :param locales: optional list of locales to load. Only the files
+            where these locales (or their general languages) are defined
+            are read, and any other locale in those files is ignored.
+            If empty, all the translations are loaded.
 
         """
-        if folderpath:
-            folderpath = self._process_folderpath(folderpath)
+        if not locales:
+            filepaths = self.find_files(folderpath)
+            wanted = None
         else:
-            folderpath = self.folderpath
+            wanted = set()
+            for locale in locales:
+                lparts = split_locale(locale)
+                wanted.add("_".join(lparts))
+                wanted.add(lparts[0])
+            index = self.locales_index
+            if folderpath or index is None:
+                index = self.index_locales(folderpath)
+            used = set()
+            for locale in wanted:
+                used.update(index.get(locale, ()))
+            filepaths = [
+                filepath for filepath in self.find_files(folderpath) if filepath in used
+            ]
 
+        files_data = self._load_files(filepaths)
+        self._loaded_stats.update(
+            (filepath, self._stats[filepath]) for filepath in filepaths
+        )
         translations = {}
-        for path in folderpath:
-            for root, dirnames, filenames in os.walk(path):
-                for ext in self.loaders_ext:
-                    pattern = "*.{}".format(ext)
-                    for filename in fnmatch.filter(filenames, pattern):
-                        if filename.startswith("."):
-                            continue
-                        filepath = join(root, filename)
-                        self._update_translations(translations, filepath)
+        for filepath in filepaths:
+            self._update_translations(
+                translations, filepath, files_data[filepath], locales=wanted
+            )
 
         return translations
@@ -1,9 +1,62 @@
+import threading
+from contextlib import contextmanager
+from functools import lru_cache
+
 from babel import Locale
+from babel.core import LOCALE_ALIASES
 from babel.dates import get_timezone
 
 from . import utils
 from .utils import DEFAULT_LOCALE, DEFAULT_TIMEZONE
 
+try:
+    from contextvars import ContextVar
+except ImportError:  # pragma:no cover
+    ContextVar = None
+
+
+class _ThreadLocalVar(object):
+
+    """A minimal stand-in for `contextvars.ContextVar` for Python < 3.7.
+    It isolates the values between threads, but not between asyncio tasks.
+    """
+
+    def __init__(self, name, default=None):
+        self.name = name
+        self._local = threading.local()
+        self._default = default
+
+    def get(self):
+        return getattr(self._local, "value", self._default)
+
+    def set(self, value):
+        token = self.get()
+        self._local.value = value
+        return token
+
+    def reset(self, token):
+        self._local.value = token
+
+
+class RequestContext(object):
+
+    """The locale and timezone of the current request, already resolved
+    and normalized, and anything else derived from them that is worth
+    reusing during the request (like the translations of that locale).
+    """
+
+    __slots__ = ("locale", "timezone", "key_index")
+
+    def __init__(self, locale, timezone):
+        self.locale = locale
+        self.timezone = timezone
+        self.key_index = None
+
+    def __repr__(self):
+        return "{}(locale={}, timezone={})".format(
+            self.__class__.__name__, self.locale, self.timezone
+        )
+
 
 class RequestManager(object):
 
@@ -21,8 +74,14 @@ class RequestManager(object):
     :param default_timezone: default timezone (as a string or as a
         `datetime.tzinfo` instance).
 
+    :param available_locales: list of the locales (as strings or
+        Babel.Locale instances) `negotiate` can choose from.
+        By default, only the default locale.
+
     """
 
+    NEGOTIATE_CACHE_SIZE = 256
+
     def __init__(
         self,
         get_locale=None,
@@ -34,9 +93,12 @@ class RequestManager(object):
     ):
         self._get_locale = get_locale
         self._get_timezone = get_timezone
+        name = "allspeak_context_{}".format(id(self))
+        self._context = (ContextVar or _ThreadLocalVar)(name, default=None)
 
         self.set_defaults(default_locale, default_timezone)
         self.translations = {}
+        self._set_available_locales(available_locales)
 
     def __repr__(self):
         return "{}(default_locale={}, default_timezone={})".format(
@@ -57,11 +119,140 @@ class RequestManager(object):
         ) or get_timezone(DEFAULT_TIMEZONE)
 
     def get_locale(self):
+        context = self._context.get()
+        if context is not None:
+            return context.locale
         if self._get_locale:
             return self._get_locale()
         return self.default_locale
 
     def get_timezone(self):
+        """Return the timezone of the current request as a `datetime.tzinfo`.
+
+        Inside `request_context` it was already resolved. Otherwise, the
+        value returned by the `get_timezone` callable is normalized (the
+        timezones are cached by name), falling back to the default timezone.
+        """
+        context = self._context.get()
+        if context is not None:
+            return context.timezone
         if self._get_timezone:
-            return self._get_timezone()
+            tzinfo = utils.normalize_timezone(self._get_timezone())
+            return tzinfo or self.default_timezone
         return self.default_timezone
+
+    def get_request_context(self):
+        """Return the :class:`RequestContext` of the current request, or
+        `None` if there isn't one.
+        """
+        return self._context.get()
+
+    def bind_request(self, locale=None, timezone=None):
+        """Resolve the locale and timezone of the current request, calling the
+        `get_locale` and `get_timezone` callables only once, and use them
+        until `unbind_request` is called, instead of calling those callables
+        again on every translation or formatting.
+
+        The values are stored in a context variable, so each thread and each
+        asyncio task sees only those of its own request.
+
+        :param locale: use this locale instead of calling `get_locale`.
+        :param timezone: use this timezone instead of calling `get_timezone`.
+
+        :return: a token to pass to `unbind_request`.
+        """
+        if not locale and self._get_locale:
+            locale = self._get_locale()
+        if not timezone and self._get_timezone:
+            timezone = self._get_timezone()
+        locale = utils.normalize_locale(locale)
+        tzinfo = utils.normalize_timezone(timezone)
+        context = RequestContext(
+            locale or self.default_locale, tzinfo or self.default_timezone
+        )
+        return self._context.set(context)
+
+    def unbind_request(self, token):
+        """Restore the state before the call to `bind_request` that returned
+        the `token`.
+        """
+        self._context.reset(token)
+
+    @contextmanager
+    def request_context(self, locale=None, timezone=None):
+        """A context manager version of `bind_request`/`unbind_request`.
+
+        Example:
+
+            with i18n.request_context():
+                ...
+
+        """
+        token = self.bind_request(locale=locale, timezone=timezone)
+        try:
+            yield self._context.get()
+        finally:
+            self.unbind_request(token)
+
+    def _set_available_locales(self, available_locales):
+        _available = []
+        for locale in available_locales or [self.default_locale]:
+            lparts = utils.split_locale(locale)
+
+            lp = "_".join(lparts)
+            if lp not in _available:
+                _available.append(lp)
+
+            if len(lparts) > 1:
+                if lparts[0] not in _available:
+                    _available.append(lparts[0])
+        self.available_locales = _available
+        self._build_negotiation_index()
+
+    def _build_negotiation_index(self):
+        """Precompute the `Locale` instances of the available locales.
+        """
+        index = {}
+        for strlocale in self.available_locales:
+            locale = utils.normalize_locale(strlocale)
+            if locale is not None:
+                index[strlocale] = locale
+        self._negotiation_index = index
+        self._negotiate = lru_cache(maxsize=self.NEGOTIATE_CACHE_SIZE)(
+            self._negotiate_locale
+        )
+
+    def negotiate(self, preferred):
+        """Return the available locale (as a :class:`babel.core.Locale`) that
+        best matches a list of preferred locales, like the ones returned by
+        the `get_*_preferred_locales` integrations, or the default locale
+        if none of them is available.
+
+        Each preferred locale is tried, in order, first as is, then by its
+        language alone (eg. `es-MX` matches `es`) and finally using the
+        Babel's alias for that language (eg. `no` matches `nb_NO`).
+        The results are memoized.
+        """
+        if not preferred:
+            return self.default_locale
+        if isinstance(preferred, str):
+            preferred = [preferred]
+        preferred = tuple(utils.locale_to_str(locale) for locale in preferred)
+        return self._negotiate(preferred) or self.default_locale
+
+    def _negotiate_locale(self, preferred):
+        index = self._negotiation_index
+        for strlocale in preferred:
+            locale = index.get(strlocale)
+            if locale is not None:
+                return locale
+            language = strlocale.split("_")[0]
+            locale = index.get(language)
+            if locale is not None:
+                return locale
+            alias = LOCALE_ALIASES.get(language)
+            if alias:
+                locale = index.get(alias) or index.get(alias.split("_")[0])
+                if locale is not None:
+                    return locale
+        return None
@@ -1,4 +1,6 @@
 import datetime
+from functools import lru_cache
+
 from babel import Locale, UnknownLocaleError
 from babel.dates import get_timezone, UTC
 
@@ -18,13 +20,32 @@ LOCALES_FOLDER = "locales"
 DEFAULT_LOCALE = "en"
 DEFAULT_TIMEZONE = UTC
 
+LOCALES_CACHE_SIZE = 256
+TIMEZONES_CACHE_SIZE = 256
+
 
 def normalize_locale(locale):
+    """Return a :class:`babel.core.Locale` instance from a string like
+    `en-US` or `en_US`, a tuple like `('en', 'US')` or a `Locale`,
+    or `None` if the locale is unknown.
+
+    The results for strings and tuples are memoized (including the unknown
+    ones) because building a `Locale` means loading its CLDR data.
+    Use ``normalize_locale.cache_info()`` to check the hits and misses and
+    ``normalize_locale.cache_clear()`` to empty the cache.
+    """
     if not locale:
         return
     if isinstance(locale, Locale):
         return locale
+    if isinstance(locale, list):
+        locale = tuple(locale)
+    if isinstance(locale, (str, tuple)):
+        return _cached_normalize_locale(locale)
+    return _normalize_locale(locale)
 
+
+def _normalize_locale(locale):
     locale = split_locale(locale)
 
     if isinstance(locale, (tuple, list)):
@@ -38,17 +59,43 @@ def normalize_locale(locale):
     return None
 
 
+_cached_normalize_locale = lru_cache(maxsize=LOCALES_CACHE_SIZE)(_normalize_locale)
+normalize_locale.cache_info = _cached_normalize_locale.cache_info
+normalize_locale.cache_clear = _cached_normalize_locale.cache_clear
+
+
 def normalize_timezone(tzinfo):
+    """Return a `datetime.tzinfo` instance from a timezone name like
+    `America/Lima` or a `datetime.tzinfo`, or `None` if the timezone
+    is unknown.
+
+    The results for strings are memoized (including the unknown ones).
+    Use ``normalize_timezone.cache_info()`` to check the hits and misses and
+    ``normalize_timezone.cache_clear()`` to empty the cache.
+    """
     if not tzinfo:
         return
     if isinstance(tzinfo, datetime.tzinfo):
         return tzinfo
+    if isinstance(tzinfo, str):
+        return _cached_normalize_timezone(tzinfo)
+    return _normalize_timezone(tzinfo)
+
+
+def _normalize_timezone(tzinfo):
     try:
         return get_timezone(tzinfo)
     except LookupError:
         return
 
 
+_cached_normalize_timezone = lru_cache(maxsize=TIMEZONES_CACHE_SIZE)(
+    _normalize_timezone
+)
+normalize_timezone.cache_info = _cached_normalize_timezone.cache_info
+normalize_timezone.cache_clear = _cached_normalize_timezone.cache_clear
+
+
 def split_locale(locale):
     """Returns a tuple (language, TERRITORY) or just (language, )
     from a a :class:`babel.core.Locale` instance or a string like `en-US` or
@@ -92,16 +139,32 @@ def _flatten(dic):
     {'a': 1, 'c.a': 2, 'c.b.x': 5, 'c.b.y': 10, 'd': [1, 2, 3]}
 
     """
+    return dict(_iter_flatten(dic))
 
-    def items():
-        for key, value in dic.items():
-            if isinstance(value, dict):
-                for subkey, subvalue in _flatten(value).items():
-                    yield str(key) + "." + str(subkey), subvalue
-            else:
-                yield key, value
 
-    return dict(items())
+def _iter_flatten(dic):
+    """Iterate over the leaves of a nested dictionary, yielding
+    ``(dotted_key, value)`` tuples in the same order as :func:`_flatten`
+    but without building any intermediate dictionary.
+
+    >> list(_iter_flatten({'a': 1, 'c': {'a': 2, 'b': {'x': 5}}}))
+    [('a', 1), ('c.a', 2), ('c.b.x', 5)]
+
+    """
+    # A stack of (prefix, items iterator), so the nested dictionaries are
+    # walked depth-first without recursion and every key is built once.
+    stack = [(None, iter(dic.items()))]
+    while stack:
+        prefix, items = stack[-1]
+        for key, value in items:
+            if prefix is not None:
+                key = prefix + str(key)
+            if isinstance(value, dict):
+                stack.append((str(key) + ".", iter(value.items())))
+                break
+            yield key, value
+        else:
+            stack.pop()
 
 
 def _is_sequence(arg):
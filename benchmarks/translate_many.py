@@ -0,0 +1,60 @@
+"""
+Compare `I18n.translate_many` with calling `I18n.translate` in a loop.
+
+Usage:
+
+    python benchmarks/translate_many.py
+
+"""
+import os
+import sys
+import tempfile
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from allspeak import I18n  # noqa
+
+NUM_KEYS = 200
+REPEAT = 5
+NUMBER = 200
+
+
+def make_locales(folderpath):
+    lines = ["en:"]
+    for i in range(NUM_KEYS):
+        lines.append("    section{}:".format(i))
+        lines.append("        title: Title number {}".format(i))
+        lines.append("        greeting: Hello {{name}}, this is {}".format(i))
+    with open(os.path.join(folderpath, "en.yml"), "w") as f:
+        f.write("\n".join(lines))
+    keys = []
+    for i in range(NUM_KEYS):
+        keys.append("section{}.title".format(i))
+        keys.append("section{}.greeting".format(i))
+    return keys
+
+
+def main():
+    with tempfile.TemporaryDirectory() as folderpath:
+        keys = make_locales(folderpath)
+        i18n = I18n(folderpath)
+
+        def loop():
+            return {key: i18n.translate(key, locale="en", name="Bob") for key in keys}
+
+        def many():
+            return i18n.translate_many(keys, locale="en", name="Bob")
+
+        assert loop() == many()
+        for name, func in (("translate loop", loop), ("translate_many", many)):
+            best = min(timeit.repeat(func, repeat=REPEAT, number=NUMBER))
+            print(
+                "{:<16} {:8.2f} µs per batch of {} keys".format(
+                    name, best / NUMBER * 1e6, len(keys)
+                )
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -1,7 +1,16 @@
 
+import datetime
+from os.path import join, dirname, abspath
+
+import pytest
+from babel import Locale
+
 from ..allspeak import Allspeak, L10n, I18n
 
 
+LOCALES_TEST = abspath(join(dirname(__file__), u'locales'))
+
+
 def test_allspeak_repr():
     speak = Allspeak()
     assert repr(speak) == 'Allspeak()'
@@ -19,3 +28,31 @@ def test_allspeak_has_i18n():
     i18n = I18n()
     for key in i18n.__dict__:
         assert hasattr(speak, key)
+
+
+def test_for_locale():
+    speak = Allspeak(LOCALES_TEST, default_locale='en')
+    es = speak.for_locale('es-PE')
+    assert es is speak.for_locale(Locale('es', 'PE'))
+    assert es.locale == Locale('es', 'PE')
+
+    assert es.translate('greeting') == u'Habla'
+    assert es('so.much.such') == u'wow'
+    assert es.translate('nope') == '<missing:nope/>'
+    assert es.pluralize({'one': u'uno', 'other': u'otros'}, 1) == u'uno'
+    assert es.format_decimal(1234.5) == u'1,234.5'
+    date = datetime.date(2020, 5, 1)
+    expected = speak.format_date(date, 'long', locale='es_PE')
+    assert es.format_date(date, 'long') == expected
+
+    with pytest.raises(AttributeError):
+        es.locale = Locale('en')
+    with pytest.raises(AttributeError):
+        es.translations
+
+
+def test_for_locale_is_reset_on_reload():
+    speak = Allspeak(LOCALES_TEST)
+    es = speak.for_locale('es')
+    speak.load_translations()
+    assert speak.for_locale('es') is not es
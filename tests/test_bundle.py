@@ -0,0 +1,91 @@
+import json
+from os.path import join, dirname, abspath, exists
+
+from ..allspeak import Reader, compile_bundles
+
+
+LOCALES_TEST = abspath(join(dirname(__file__), u'locales'))
+
+
+def read_json(path):
+    with open(path) as f:
+        return json.load(f)
+
+
+def test_compile_bundles_json(tmpdir):
+    output = str(tmpdir)
+    result = compile_bundles(LOCALES_TEST, output, format='json')
+    assert sorted(result.keys()) == ['en', 'es', 'es_PE']
+
+    filename, changed = result['es_PE']
+    assert changed
+    assert filename.startswith('es_PE.') and filename.endswith('.json')
+    bundle = read_json(join(output, filename))
+    assert bundle['locale'] == 'es_PE'
+    assert bundle['messages']['greeting'] == u'Habla'
+    assert bundle['messages']['so']['much']['such'] == u'wow'
+    assert bundle['plural_rules'] == {'one': 'n in 1'}
+
+    manifest = read_json(join(output, 'manifest.json'))
+    assert manifest == {
+        'json': {locale: name for locale, (name, _) in result.items()},
+    }
+
+
+def test_compile_bundles_js(tmpdir):
+    output = str(tmpdir)
+    result = compile_bundles(LOCALES_TEST, output, locales=['en'])
+    assert list(result.keys()) == ['en']
+    filename, _ = result['en']
+    with open(join(output, filename)) as f:
+        content = f.read()
+    assert content.startswith('(function(w){')
+    assert '"greeting":"Hello World!"' in content
+    assert "b.plural=(function(n)" in content
+    assert '\n' not in content
+
+
+def test_compile_bundles_is_incremental(tmpdir):
+    folder = tmpdir.mkdir('locales')
+    folder.join('en.yml').write(u'en:\n    greeting: Hello\n')
+    folder.join('es.yml').write(u'es:\n    greeting: Hola\n')
+    output = str(tmpdir.join('bundles'))
+
+    first = compile_bundles(str(folder), output)
+    assert all(changed for _, changed in first.values())
+
+    folder.join('es.yml').write(u'es:\n    greeting: Hola mundo\n')
+    second = compile_bundles(str(folder), output)
+    assert second['en'] == (first['en'][0], False)
+    assert second['es'][1]
+    assert second['es'][0] != first['es'][0]
+    assert not exists(join(output, first['es'][0]))
+
+
+def test_compile_bundles_formats_and_prefixes_dont_collide(tmpdir):
+    output = str(tmpdir)
+    js = compile_bundles(LOCALES_TEST, output)
+    json_ = compile_bundles(LOCALES_TEST, output, format='json')
+    cats = compile_bundles(LOCALES_TEST, output, prefixes=['cat'])
+
+    for result in (js, json_, cats):
+        for filename, _ in result.values():
+            assert exists(join(output, filename))
+    assert compile_bundles(LOCALES_TEST, output)['en'] == (js['en'][0], False)
+
+    manifest = read_json(join(output, 'manifest.json'))
+    assert sorted(manifest.keys()) == ['js', 'js:cat', 'json']
+
+
+def test_compile_bundles_prefixes(tmpdir):
+    output = str(tmpdir)
+    reader = Reader(LOCALES_TEST)
+    result = compile_bundles(
+        None, output, prefixes=['sub1.sub2', 'cat', 'nope'], format='json',
+        plural_rules=False, reader=reader)
+    bundle = read_json(join(output, result['en'][0]))
+    assert bundle['messages'] == {
+        'sub1': {'sub2': {'sub3': u'Still here'}},
+        'cat': u'miaow',
+    }
+    assert 'plural_rules' not in bundle
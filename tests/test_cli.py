@@ -0,0 +1,34 @@
+from os.path import join, dirname, abspath
+
+from ..allspeak.cli import main
+
+
+LOCALES_TEST = abspath(join(dirname(__file__), u'locales'))
+
+
+def test_no_command(capsys):
+    assert main([]) == 2
+    assert 'compile' in capsys.readouterr().out
+
+
+def test_compile(tmpdir, capsys):
+    output = str(tmpdir)
+    assert main(['compile', LOCALES_TEST, '-o', output, '-l', 'es', '-f', 'json']) == 0
+    out = capsys.readouterr().out
+    assert 'updated' in out
+    assert 'es.' in out
+
+    assert main(['compile', LOCALES_TEST, '-o', output, '-l', 'es', '-f', 'json']) == 0
+    assert 'unchanged' in capsys.readouterr().out
+
+
+def test_extract(tmpdir, capsys):
+    src = tmpdir.mkdir('src')
+    src.join('views.py').write('_("greeting")\n_("accented")\n')
+    assert main(['extract', str(src), '-t', LOCALES_TEST, '-l', 'es']) == 0
+
+    assert main(['extract', str(src), '-t', LOCALES_TEST, '-l', 'en']) == 1
+    out = capsys.readouterr().out
+    assert 'en (1 missing)' in out
+    assert 'accented' in out
+    assert 'views.py:2' in out
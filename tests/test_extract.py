@@ -0,0 +1,89 @@
+# coding=utf-8
+import io
+from os.path import join, dirname, abspath
+
+from ..allspeak.extract import extract_keys, scan_files, find_missing_keys
+
+
+LOCALES_TEST = abspath(join(dirname(__file__), u'locales'))
+
+
+def write(path, content):
+    with io.open(str(path), mode='w', encoding='utf8') as f:
+        f.write(content)
+
+
+def test_extract_keys():
+    source = u'''
+from allspeak import I18n
+title = i18n.translate('greeting')
+name = lazy_translate("apple", 3)
+msg = _(
+    'sub1.sub2.sub3')
+ignored = translate(key)
+ignored = my_translate('nope')
+ignored = gettext_('nope')
+'''
+    assert extract_keys(source) == [
+        ('greeting', 3),
+        ('apple', 4),
+        ('sub1.sub2.sub3', 5),
+    ]
+
+
+def test_extract_keys_jinja():
+    source = u'<h1>{{ _("greeting") }}</h1>\n<p>{{ i18n.translate("ñandú", 2) }}</p>'
+    assert extract_keys(source) == [('greeting', 1), (u'ñandú', 2)]
+
+
+def test_scan_files(tmpdir):
+    write(tmpdir.join('views.py'), u'_("greeting")\n_("nope")')
+    tmpdir.mkdir('templates')
+    write(tmpdir.join('templates', 'index.html'), u'{{ _("apple") }}')
+    write(tmpdir.join('notes.txt'), u'_("ignored")')
+    tmpdir.mkdir('.hidden')
+    write(tmpdir.join('.hidden', 'a.py'), u'_("ignored")')
+
+    result = scan_files([str(tmpdir)])
+    assert result == {
+        str(tmpdir.join('views.py')): [('greeting', 1), ('nope', 2)],
+        str(tmpdir.join('templates', 'index.html')): [('apple', 1)],
+    }
+
+
+def test_scan_files_cache(tmpdir):
+    src = tmpdir.mkdir('src')
+    cache_path = str(tmpdir.join('keys.json'))
+    write(src.join('a.py'), u'_("greeting")')
+    write(src.join('b.py'), u'_("apple")')
+
+    result = scan_files([str(src)], cache_path=cache_path)
+    assert result[str(src.join('a.py'))] == [('greeting', 1)]
+
+    write(src.join('b.py'), u'\n_("with_html")')
+    result = scan_files([str(src)], cache_path=cache_path)
+    assert result[str(src.join('a.py'))] == [('greeting', 1)]
+    assert result[str(src.join('b.py'))] == [('with_html', 2)]
+
+    src.join('b.py').remove()
+    result = scan_files([str(src)], cache_path=cache_path)
+    assert list(result.keys()) == [str(src.join('a.py'))]
+
+
+def test_scan_files_processes(tmpdir):
+    for i in range(4):
+        write(tmpdir.join('f{}.py'.format(i)), u'_("key{}")'.format(i))
+    result = scan_files([str(tmpdir)], processes=2)
+    assert sorted(result.values()) == [[('key{}'.format(i), 1)] for i in range(4)]
+
+
+def test_find_missing_keys():
+    keys_by_file = {
+        'a.py': [('greeting', 1), ('apple.one', 2)],
+        'b.html': [('accented', 3), ('greeting', 4)],
+    }
+    missing = find_missing_keys(keys_by_file, LOCALES_TEST, locales=['en', 'es'])
+    assert missing == {
+        'en': {'accented': ['b.html:3']},
+        'es': {'apple.one': ['a.py:2']},
+    }
@@ -1,10 +1,16 @@
+import os
+import threading
+import time
 from os.path import join, dirname, abspath
 
+import pytest
 from babel import Locale
 from babel.dates import UTC
 from markupsafe import Markup
 
 from ..allspeak import I18n
+from ..allspeak.compact import CompactIndex
+from ..allspeak.i18n import Message
 
 
 LOCALES_TEST = abspath(join(dirname(__file__), u'locales'))
@@ -111,6 +117,220 @@ def test_key_lookup():
     assert i18n.key_lookup(Locale('fr'), 'greeting') is None
 
 
+def test_get_key_index():
+    i18n = I18n(LOCALES_TEST)
+
+    index = i18n.get_key_index(Locale('es', 'PE'))
+    assert index['greeting'] == u'Habla'
+    assert index['so.much.such'] == u'wow'
+    assert index['so.much'] == {'such': u'wow'}
+    assert i18n.get_key_index('es_PE') is index
+
+    assert i18n.get_key_index(Locale('fr')) is None
+
+
+def test_key_index_is_reset():
+    i18n = I18n(LOCALES_TEST)
+    assert i18n.key_lookup('es', 'greeting') == u'Hola mundo'
+
+    i18n.translations = {'es': {'greeting': u'Hola'}}
+    assert i18n.key_lookup('es', 'greeting') == u'Hola'
+
+
+def test_compact():
+    i18n = I18n(LOCALES_TEST, compact=True)
+    index = i18n.get_key_index(Locale('es', 'PE'))
+    assert isinstance(index, CompactIndex)
+    assert index['greeting'] == u'Habla'
+    assert index['so.much.such'] == u'wow'
+    assert index.get('nope') is None
+    assert 'nope' not in index
+    with pytest.raises(KeyError):
+        index['nope']
+
+    assert i18n.translate('greeting', locale='es_PE') == u'Habla'
+    assert i18n.translate('greeting', locale='en') == u'Hello World!'
+    # The keys are shared by all the locales
+    assert i18n.get_key_index('en')._slots is index._slots
+
+
+def test_compact_index():
+    slots = {}
+    index1 = CompactIndex(slots, {'a': u'1', 'b': u'2'})
+    index2 = CompactIndex(slots, {'b': u'3', 'c': u'4'})
+    assert sorted(slots) == ['a', 'b', 'c']
+    assert sorted(index1) == ['a', 'b']
+    assert len(index1) == 2
+    assert 'c' not in index1
+    assert dict(index2) == {'b': u'3', 'c': u'4'}
+
+
+def test_memory_footprint():
+    i18n = I18n(LOCALES_TEST)
+    i18n.get_key_index('es_PE')
+    footprint = i18n.memory_footprint()
+    assert footprint['translations'] > 0
+    assert footprint['key_index'] > 0
+    assert footprint['total'] == (
+        footprint['translations'] + footprint['key_index']
+    )
+
+
+def test_lazy_loading():
+    i18n = I18n(LOCALES_TEST, lazy=True)
+    assert i18n.translations == {}
+    assert sorted(i18n.available_locales) == ['en', 'es', 'es_PE']
+
+    assert i18n.translate('greeting', locale='es_PE') == u'Habla'
+    assert sorted(i18n.translations.keys()) == ['es', 'es_PE']
+
+    assert i18n.translate('cat', locale='en') == u'miaow'
+    assert sorted(i18n.translations.keys()) == ['en', 'es', 'es_PE']
+    assert i18n.translate('so.much.such', locale='es_PE') == u'wow'
+
+
+def test_lazy_loading_in_threads():
+    i18n = I18n(LOCALES_TEST, lazy=True)
+    load = i18n.reader.load_translations
+
+    def slow_load(*args, **kwargs):
+        data = load(*args, **kwargs)
+        time.sleep(0.05)
+        return data
+
+    i18n.reader.load_translations = slow_load
+    threads = [
+        threading.Thread(target=i18n.translate, args=('cat', None, locale))
+        for locale in ('en', 'es')
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert sorted(i18n.translations.keys()) == ['en', 'es']
+    assert i18n.missing_locales == []
+
+
+def test_missing_locale_is_not_reloaded():
+    i18n = I18n(LOCALES_TEST)
+    assert i18n.translate('greeting', locale='fr') == '<missing:greeting/>'
+    assert i18n.translate('greeting', locale='fr') == '<missing:greeting/>'
+    assert i18n.missing_reloads_count == 1
+    assert i18n.missing_locales == ['fr']
+
+    i18n.load_translations()
+    assert i18n.missing_locales == []
+    i18n.translate('greeting', locale='fr')
+    assert i18n.missing_reloads_count == 2
+
+
+def test_missing_locale_reload_policies():
+    i18n = I18n(LOCALES_TEST, reload_missing='always')
+    i18n.translate('greeting', locale='fr')
+    i18n.translate('greeting', locale='fr')
+    assert i18n.missing_reloads_count == 2
+
+    i18n = I18n(LOCALES_TEST, reload_missing='ttl', reload_missing_ttl=3600)
+    i18n.translate('greeting', locale='fr')
+    i18n.translate('greeting', locale='fr')
+    assert i18n.missing_reloads_count == 1
+    i18n.reload_missing_ttl = 0
+    i18n.translate('greeting', locale='fr')
+    assert i18n.missing_reloads_count == 2
+
+    with pytest.raises(AssertionError):
+        I18n(LOCALES_TEST, reload_missing='sometimes')
+
+
+def test_reload_changed(tmpdir):
+    folder = tmpdir.mkdir('locales')
+    folder.join('en.yml').write(u'en:\n    greeting: Hello\n')
+    folder.join('es.yml').write(u'es:\n    greeting: Hola\n')
+    i18n = I18n(str(folder))
+    trans_en = i18n.translations['en']
+
+    folder.join('es.yml').write(u'es:\n    greeting: Hola mundo\n')
+    os.utime(str(folder.join('es.yml')), (1, 1))
+    assert i18n.reload_changed() == ['es']
+    assert i18n.translate('greeting', locale='es') == u'Hola mundo'
+    assert i18n.translations['en'] is trans_en
+    assert i18n.reload_changed() == []
+
+    folder.join('es.yml').remove()
+    assert i18n.reload_changed() == ['es']
+    assert 'es' not in i18n.translations
+    assert i18n.available_locales == ['en']
+
+
+def test_reload_changed_lazy_new_locale(tmpdir):
+    folder = tmpdir.mkdir('locales')
+    folder.join('en.yml').write(u'en:\n    greeting: Hello\n')
+    i18n = I18n(str(folder), lazy=True)
+    assert i18n.translate('greeting', locale='en') == u'Hello'
+    assert i18n.negotiate(['fr']) == Locale('en')
+
+    folder.join('fr.yml').write(u'fr:\n    greeting: Bonjour\n')
+    assert i18n.reload_changed() == []
+    assert i18n.negotiate(['fr']) == Locale('fr')
+    assert i18n.translate('greeting', locale='fr') == u'Bonjour'
+
+
+def test_outdated_key_index_is_not_stored():
+    i18n = I18n(LOCALES_TEST)
+    i18n.translations = dict(i18n.translations)
+    get_translations = i18n.get_translations_from_locale
+
+    def replace_translations(strlocale):
+        result = get_translations(strlocale)
+        i18n.translations = dict(i18n.translations)
+        return result
+
+    i18n.get_translations_from_locale = replace_translations
+    assert i18n.for_locale('es').translate('greeting') == u'Hola mundo'
+    assert i18n._key_index == {}
+    assert i18n._bound == {}
+
+
+def test_watch(tmpdir):
+    folder = tmpdir.mkdir('locales')
+    folder.join('en.yml').write(u'en:\n    greeting: Hello\n')
+    i18n = I18n(str(folder), watch=0.01)
+    try:
+        folder.join('en.yml').write(u'en:\n    greeting: Hello World\n')
+        os.utime(str(folder.join('en.yml')), (1, 1))
+        for _ in range(200):
+            if i18n.translate('greeting', locale='en') == u'Hello World':
+                break
+            time.sleep(0.01)
+        assert i18n.translate('greeting', locale='en') == u'Hello World'
+    finally:
+        i18n.stop_watching()
+
+
+def test_negotiate():
+    i18n = I18n(LOCALES_TEST)
+    assert i18n.negotiate(['fr', 'es-MX']) == Locale('es')
+    assert i18n.negotiate(['es-PE', 'es']) == Locale('es', 'PE')
+    assert i18n.negotiate(['fr']) == Locale('en')
+
+
+def test_translate_in_request_context():
+    calls = []
+
+    def get_locale():
+        calls.append(1)
+        return 'es_PE'
+
+    i18n = I18n(LOCALES_TEST, get_locale=get_locale)
+    with i18n.request_context():
+        assert i18n.translate('greeting') == u'Habla'
+        assert i18n.translate('so.much.such') == u'wow'
+        assert i18n.translate('greeting', locale='en') == u'Hello World!'
+        assert i18n.translate('nope') == '<missing:nope/>'
+    assert len(calls) == 1
+
+
 def test_translate():
     i18n = I18n(LOCALES_TEST, default_locale='es-PE')
 
@@ -127,6 +347,49 @@ def test_translate():
     assert i18n.translate('with_html', locale=locale) == Markup(u'<b>Hello</b>')
 
 
+def test_message():
+    message = Message(u'Hello World!')
+    assert message.fields == frozenset()
+    assert message.format({'count': None}) == u'Hello World!'
+
+    message = Message(u'{{escaped}} braces')
+    assert message.format({}) == u'{escaped} braces'
+
+    message = Message(u'{count} apples for {user.name}')
+    assert message.fields == frozenset(['count', 'user'])
+    assert message.missing({'count': 2}) == set(['user'])
+    with pytest.raises(KeyError):
+        message.format({'count': 2})
+
+
+def test_translate_compiles_messages_once():
+    i18n = I18n(LOCALES_TEST)
+    locale = Locale('en')
+    i18n.translate('apple', 2, locale=locale)
+    message = i18n.get_message(u'{count} apples')
+    assert i18n.translate('apple', 3, locale=locale) == u'3 apples'
+    assert i18n.get_message(u'{count} apples') is message
+
+
+def test_translate_many():
+    i18n = I18n(LOCALES_TEST, default_locale='es-PE')
+    keys = ['greeting', 'so.much.such', 'bla']
+    expected = {key: i18n.translate(key) for key in keys}
+    assert i18n.translate_many(keys) == expected
+    assert i18n.translate_many(iter(keys)) == expected
+
+    locale = Locale('en')
+    result = i18n.translate_many(['apple', 'with_html'], 10, locale=locale)
+    assert result == {'apple': u'10 apples', 'with_html': Markup(u'<b>Hello</b>')}
+
+    with i18n.request_context(locale='es'):
+        assert i18n.translate_many(['greeting']) == {'greeting': u'Hola mundo'}
+
+    es = i18n.for_locale('es')
+    assert es.translate_many(['greeting', 'bla']) == {
+        'greeting': u'Hola mundo', 'bla': '<missing:bla/>'}
+
+
 def test_translate_pluralize():
     i18n = I18n(LOCALES_TEST, default_locale='es-PE')
     locale = Locale('en')
@@ -203,3 +466,44 @@ def test_for_incomplete_locales():
 
     expected = {}
     assert i18n.test_for_incomplete_locales('es', 'pt') == expected
+
+
+def test_for_incomplete_locales_sources():
+    i18n = I18n(LOCALES_TEST)
+    result = i18n.test_for_incomplete_locales('en', 'es', sources=True)
+    assert result['en'] == {
+        'accented': [join(LOCALES_TEST, 'es.yml')],
+        'so.much.such': [join(LOCALES_TEST, 'sub', 'es.yml')],
+    }
+    missing = result['es']
+    assert missing['apple.one'] == [join(LOCALES_TEST, 'en.yml')]
+    assert missing['sub1.sub4'] == [join(LOCALES_TEST, 'sub', 'en.yml')]
+    assert 'greeting' not in missing
+
+
+def test_for_incomplete_locales_sources_dont_hide_changes(tmpdir):
+    folder = tmpdir.mkdir('locales')
+    folder.join('en.yml').write(u'en:\n    greeting: Hello\n    bye: Bye\n')
+    folder.join('es.yml').write(u'es:\n    greeting: Hola\n')
+    i18n = I18n(str(folder))
+
+    folder.join('es.yml').write(u'es:\n    greeting: Hola mundo\n    bye: Chau\n')
+    os.utime(str(folder.join('es.yml')), (1, 1))
+    result = i18n.test_for_incomplete_locales(sources=True)
+    assert result == {'es': {'bye': [str(folder.join('en.yml'))]}}
+
+    assert i18n.reload_changed() == ['es']
+    assert i18n.translate('greeting', locale='es') == u'Hola mundo'
+    assert i18n.test_for_incomplete_locales(sources=True) == {}
+
+
+def test_for_incomplete_locales_is_incremental():
+    i18n = I18n(LOCALES_TEST)
+    expected = i18n.test_for_incomplete_locales('en', 'es')
+    en_keys = i18n._locale_keys['en'][1]
+    es_keys = i18n._locale_keys['es'][1]
+
+    i18n.load_translations('es')
+    assert i18n.test_for_incomplete_locales('en', 'es') == expected
+    assert i18n._locale_keys['en'][1] is en_keys
+    assert i18n._locale_keys['es'][1] is not es_keys
@@ -25,3 +25,33 @@ def test_get_django_preferred_locales():
     req = get_test_request(make_django_request, headers=headers)
     langs = integrations.get_django_preferred_locales(req)
     assert langs == ['fr', 'pt', 'es']
+
+
+def test_preferred_locales_without_header():
+    req = get_test_request(make_werkzeug_request)
+    assert integrations.get_werkzeug_preferred_locales(req) is None
+    req = get_test_request(make_webob_request)
+    assert integrations.get_webob_preferred_locales(req) is None
+    req = get_test_request(make_django_request)
+    assert integrations.get_django_preferred_locales(req) is None
+
+
+def test_parse_accept_language():
+    parse = integrations.parse_accept_language
+    assert parse('es-PE, en;q=0.5, es;q=0.8, *;q=0.1') == ('es_PE', 'es', 'en')
+    # Numeric, not alphabetic, ordering of the quality values
+    assert parse('fr;q=0.9, de;q=0.10, it;q=1') == ('it', 'fr', 'de')
+    # Same quality keep their order
+    assert parse('pt, en-us, es') == ('pt', 'en_US', 'es')
+    # Zero and invalid quality values are ignored
+    assert parse('pt;q=0, en;q=abc, es') == ('es', )
+    assert parse('') == ()
+
+
+def test_parse_accept_language_cache():
+    integrations.parse_accept_language.cache_clear()
+    integrations.parse_accept_language('fr, es;q=0.5')
+    integrations.parse_accept_language('fr, es;q=0.5')
+    info = integrations.parse_accept_language.cache_info()
+    assert info.hits == 1
+    assert info.misses == 1
@@ -1,5 +1,6 @@
-from datetime import date, datetime, time, timedelta
+from datetime import date, datetime, time, timedelta, timezone
 
+import pytest
 from babel import Locale
 from babel.dates import UTC, get_timezone
 
@@ -107,6 +108,111 @@ def test_format_datetime():
     assert l10n.format_datetime(dt, dformat, locale="en") == expected
 
 
+def test_format_datetime_by_name():
+    l10n = L10n(default_timezone="America/Lima")
+    dt = datetime(2007, 4, 1, 15, 30)
+
+    expected = "Apr 1, 2007, 10:30:00 AM"
+    assert l10n.format_datetime(dt, "medium", locale="en") == expected
+    expected = "April 1, 2007 at 3:30:00 PM UTC"
+    assert l10n.format_datetime(dt, "long", rebase=False, locale="en") == expected
+
+
+def test_format_datetime_by_name_other_values():
+    l10n = L10n()
+
+    expected = "Jul 14, 2017, 2:40:00 AM"
+    assert l10n.format_datetime(1500000000, locale="en") == expected
+    assert l10n.format_datetime(1500000000.0, locale="en") == expected
+    expected = "Apr 1, 2007, 12:00:00 AM"
+    assert l10n.format_datetime(date(2007, 4, 1), locale="en") == expected
+    assert l10n.format_datetime(time(15, 30), locale="en").endswith("3:30:00 PM")
+
+
+def test_format_datetime_by_name_stdlib_tzinfo():
+    l10n = L10n()
+    dt = datetime(2007, 4, 1, 15, 30)
+
+    expected = "Apr 1, 2007, 3:30:00 PM"
+    assert l10n.format_datetime(dt, tzinfo=timezone.utc, locale="en") == expected
+    lima = timezone(timedelta(hours=-5))
+    expected = "Apr 1, 2007, 10:30:00 AM"
+    assert l10n.format_datetime(dt, tzinfo=lima, locale="en") == expected
+
+
+def test_date_patterns_are_cached():
+    l10n = L10n()
+    d = date(2007, 4, 1)
+
+    assert l10n.format_date(d, "short", locale="en") == "4/1/07"
+    pattern = l10n._date_patterns[("en", "date", "short")]
+    assert l10n.format_date(d, "short", locale="en") == "4/1/07"
+    assert l10n._date_patterns[("en", "date", "short")] is pattern
+
+    l10n.set_date_formats({"date.short": "'trolololo'"})
+    assert l10n.format_date(d, "short", locale="en") == "trolololo"
+
+
+def test_format_datetime_many():
+    l10n = L10n(default_timezone="America/Lima")
+    values = [datetime(2007, 4, 1, 15, 30), None, datetime(2007, 4, 2, 3, 0)]
+
+    result = l10n.format_datetime_many(values, "yyyy-MM-dd HH:mm", locale="en")
+    assert not isinstance(result, list)
+    assert list(result) == ["2007-04-01 10:30", "", "2007-04-01 22:00"]
+
+    result = l10n.format_datetime_many(values[:1], "medium", rebase=False, locale="en")
+    assert list(result) == ["Apr 1, 2007, 3:30:00 PM"]
+
+
+def test_format_date_many():
+    l10n = L10n(default_timezone="America/Lima")
+    values = [date(2007, 4, 1), datetime(2007, 4, 2, 3, 0), ""]
+
+    result = l10n.format_date_many(values, "short", locale="en")
+    assert list(result) == ["4/1/07", "4/1/07", ""]
+    result = l10n.format_date_many(values, "short", rebase=False, locale="en")
+    assert list(result) == ["4/1/07", "4/2/07", ""]
+
+
+def test_format_datetime_many_other_values():
+    l10n = L10n()
+    values = [date(2007, 4, 1), 1500000000]
+
+    result = l10n.format_datetime_many(values, "yyyy-MM-dd HH:mm", locale="en")
+    assert list(result) == ["2007-04-01 00:00", "2017-07-14 02:40"]
+
+
+def test_format_many_numpy():
+    numpy = pytest.importorskip("numpy")
+    l10n = L10n(default_timezone="America/Lima")
+    days = numpy.array(["2007-04-01", "NaT"], dtype="datetime64[D]")
+    instants = numpy.array(["2007-04-02T03:00:00.123456789"], dtype="datetime64[ns]")
+
+    result = l10n.format_datetime_many(days, "yyyy-MM-dd HH:mm", locale="en")
+    assert list(result) == ["2007-03-31 19:00", ""]
+    result = l10n.format_datetime_many(instants, "yyyy-MM-dd HH:mm", locale="en")
+    assert list(result) == ["2007-04-01 22:00"]
+
+    result = l10n.format_date_many(days, "short", locale="en")
+    assert list(result) == ["4/1/07", ""]
+    result = l10n.format_date_many(instants, "short", locale="en")
+    assert list(result) == ["4/1/07"]
+
+
+def test_format_many_stdlib_tzinfo():
+    l10n = L10n()
+    values = [datetime(2007, 4, 2, 3, 0)]
+    lima = timezone(timedelta(hours=-5))
+
+    result = l10n.format_datetime_many(values, "yyyy-MM-dd HH:mm", tzinfo=lima)
+    assert list(result) == ["2007-04-01 22:00"]
+    result = l10n.format_datetime_many(values, "HH:mm", tzinfo=timezone.utc)
+    assert list(result) == ["03:00"]
+    result = l10n.format_date_many(values, "short", locale="en", tzinfo=lima)
+    assert list(result) == ["4/1/07"]
+
+
 def test_format_now():
     l10n = L10n()
     now = datetime.utcnow()
@@ -209,6 +315,51 @@ def test_format_currency():
     assert l10n.format_currency(None, "USD", locale="en_US") == ""
 
 
+def test_number_patterns_are_cached():
+    l10n = L10n()
+
+    assert l10n.format_currency(1099.98, "JPY", locale="en_US") == "\xa51,100"
+    key = ("en_US", "currency", None, "JPY", True, "standard")
+    pattern = l10n._number_patterns[key]
+    assert pattern.prefix[0] == "\xa5"
+    assert l10n.format_currency(5, "JPY", locale="en_US") == "\xa55"
+    assert (
+        l10n.format_currency(5, "JPY", currency_digits=False, locale="en_US")
+        == "\xa55.00"
+    )
+    assert l10n.format_currency(-5, "USD", locale="en_US") == "-$5.00"
+
+    l10n.clear_format_cache()
+    assert l10n._number_patterns == {}
+    assert l10n.format_decimal(1.2345, locale="en_US") == "1.234"
+
+
+def test_format_decimal_many():
+    l10n = L10n()
+
+    result = l10n.format_decimal_many([1.2345, 12345, None], locale="de_DE")
+    assert result == ["1,234", "12.345", ""]
+    values = iter([-1.2345])
+    result = l10n.format_decimal_many(values, format="#,##0.##;-#", locale="en")
+    assert result == ["-1.23"]
+
+
+def test_format_currency_many():
+    l10n = L10n()
+
+    result = l10n.format_currency_many([1099.98, -5, ""], "USD", locale="en_US")
+    assert result == ["$1,099.98", "-$5.00", ""]
+    result = l10n.format_currency_many([1099.98], "EUR", locale="de_DE")
+    assert result == ["1.099,98\xa0\u20ac"]
+
+
+def test_format_percent_many():
+    l10n = L10n()
+
+    result = l10n.format_percent_many((0.34, 25.1234), locale="en_US")
+    assert result == ["34%", "2,512%"]
+
+
 def test_format_percent():
     l10n = L10n()
 
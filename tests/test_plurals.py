@@ -1,6 +1,8 @@
+import pytest
 from babel import Locale
 
-from ..allspeak import pluralize
+from ..allspeak import pluralize, pluralize_many
+from ..allspeak.i18n import get_plural_form, get_plural_table
 
 
 def test_pluralize_numbers():
@@ -212,3 +214,50 @@ def test_pluralize_russian():
     assert pluralize(d, 121, locale) == u'one'
     assert pluralize(d, 122, locale) == u'few'
     assert pluralize(d, 125, locale) == u'many'
+
+
+def test_pluralize_locale():
+    d = {
+        'one': u'Una manzana',
+        'many': u'{count} manzanas',
+    }
+    assert pluralize(d, 1, 'es') == u'Una manzana'
+    assert pluralize(d, 2, Locale('es')) == u'{count} manzanas'
+    assert pluralize(d, 1000001, 'es') == u'{count} manzanas'
+
+
+def test_pluralize_many():
+    d = {
+        0: u'No apples',
+        'one': u'One apple',
+        'other': u'{count} apples',
+    }
+    counts = [0, 1, 2, 1, None, 5000]
+    expected = [pluralize(d, count) for count in counts]
+    assert pluralize_many(d, counts) == expected
+    assert pluralize_many(d, iter(counts)) == expected
+    assert pluralize_many(d, []) == []
+
+
+def test_get_plural_table():
+    table = get_plural_table('en', size=3)
+    assert table == ('other', 'one', 'other')
+    assert get_plural_table(Locale('en'), size=3) is table
+
+
+def test_plural_table_size():
+    d = {'one': u'One apple', 'other': u'{count} apples'}
+    counts = [0, 1, 2, 1, 5000]
+    expected = pluralize_many(d, counts)
+    assert pluralize_many(d, counts, table_size=2) == expected
+    assert pluralize_many(d, counts, table_size=0) == expected
+    assert get_plural_form('en', 1, table_size=0) == 'one'
+    assert get_plural_form('en', 2, table_size=2) == 'other'
+
+
+def test_pluralize_many_numpy():
+    numpy = pytest.importorskip('numpy')
+    d = {'one': u'One apple', 'other': u'{count} apples'}
+    counts = numpy.array([1, 2, 3])
+    expected = [u'One apple', u'{count} apples', u'{count} apples']
+    assert pluralize_many(d, counts) == expected
@@ -1,6 +1,11 @@
+import os
+from glob import glob
 from os.path import join, dirname, abspath
 
-from ..allspeak import Reader, parse_yaml
+import pytest
+
+from ..allspeak import Reader, get_json_data, parse_yaml
+from ..allspeak.reader import get_strict_yaml_data
 
 
 LOCALES_TEST = abspath(join(dirname(__file__), u'locales'))
@@ -126,3 +131,252 @@ a_dict:
     result = parse_yaml(yaml)
     print(result)
     assert result == expected
+
+
+def test_find_files():
+    reader = Reader(LOCALES_TEST)
+    result = [filepath[len(LOCALES_TEST) + 1:] for filepath in reader.find_files()]
+    assert sorted(result) == sorted([
+        'en.yml', 'es.yml', 'es_PE.yml', 'multilang.yml', 'sub/en.yml', 'sub/es.yml',
+    ])
+
+
+def test_snapshot_cache(tmpdir):
+    cache_path = str(tmpdir.join('snapshot'))
+    reader = Reader(LOCALES_TEST, cache_path=cache_path)
+    expected = reader.load_translations()
+    assert os.path.exists(cache_path)
+
+    reader = Reader(LOCALES_TEST, cache_path=cache_path)
+    reader._load_file = None  # Nothing should be parsed again
+    assert reader.load_translations() == expected
+
+
+def test_snapshot_cache_reparse_changed(tmpdir):
+    folder = tmpdir.mkdir('locales')
+    folder.join('en.yml').write(u'en:\n    greeting: Hello\n')
+    folder.join('es.yml').write(u'es:\n    greeting: Hola\n')
+    cache_path = str(tmpdir.join('snapshot'))
+
+    reader = Reader(str(folder), cache_path=cache_path)
+    assert reader.load_translations()['es']['greeting'] == u'Hola'
+
+    folder.join('es.yml').write(u'es:\n    greeting: Hola mundo\n')
+    os.utime(str(folder.join('es.yml')), (1, 1))
+    parsed = []
+    load_file = reader._load_file
+
+    def _load_file(filepath):
+        parsed.append(filepath)
+        return load_file(filepath)
+
+    reader._load_file = _load_file
+    data = reader.load_translations()
+    assert data['es']['greeting'] == u'Hola mundo'
+    assert data['en']['greeting'] == u'Hello'
+    assert parsed == [str(folder.join('es.yml'))]
+
+
+def test_snapshot_cache_corrupted(tmpdir):
+    cache_path = tmpdir.join('snapshot')
+    cache_path.write(u'not a pickle')
+    reader = Reader(LOCALES_TEST, cache_path=str(cache_path))
+    assert reader.load_translations()['en']['cat'] == u'miaow'
+
+
+def test_snapshot_cache_is_read_once(tmpdir):
+    cache_path = str(tmpdir.join('snapshot'))
+    Reader(LOCALES_TEST, cache_path=cache_path).load_translations()
+
+    reader = Reader(LOCALES_TEST, cache_path=cache_path)
+    reader.index_locales()
+    expected = reader.load_translations(locales=['en'])
+    os.remove(cache_path)
+    reader._load_file = None  # Nothing should be parsed again
+    assert reader.load_translations(locales=['es']) != expected
+    assert not os.path.exists(cache_path)
+
+
+def test_snapshot_cache_not_writable(tmpdir):
+    cache_path = str(tmpdir.join('missing', 'snapshot'))
+    reader = Reader(LOCALES_TEST, cache_path=cache_path)
+    assert reader.load_translations()['en']['cat'] == u'miaow'
+    assert not os.path.exists(cache_path)
+
+
+def test_load_translations_in_parallel():
+    expected = Reader([LOCALES_TEST, LOCALES_TEST2]).load_translations()
+    reader = Reader([LOCALES_TEST, LOCALES_TEST2], processes=2)
+    assert reader.load_translations() == expected
+    assert sorted(reader.filepaths) == sorted(reader.find_files())
+
+
+def test_index_locales():
+    reader = Reader(LOCALES_TEST)
+    index = reader.index_locales()
+    assert sorted(index.keys()) == ['en', 'es', 'es_PE']
+    assert index['es_PE'] == [join(LOCALES_TEST, 'es_PE.yml')]
+    assert join(LOCALES_TEST, 'multilang.yml') in index['en']
+    assert reader.locales_index is index
+
+
+def test_load_translations_for_locales():
+    reader = Reader(LOCALES_TEST)
+    data = reader.load_translations(locales=['es_PE'])
+    assert sorted(data.keys()) == ['es', 'es_PE']
+    assert data['es']['cat'] == u'miau'
+    assert data['es_PE']['greeting'] == u'Habla'
+    assert join(LOCALES_TEST, 'en.yml') not in reader.filepaths
+
+    data = reader.load_translations(locales=['fr'])
+    assert data == {}
+
+
+def test_find_changes(tmpdir):
+    folder = tmpdir.mkdir('locales')
+    folder.join('en.yml').write(u'en:\n    greeting: Hello\n')
+    folder.join('es.yml').write(u'es:\n    greeting: Hola\n')
+    reader = Reader(str(folder))
+    reader.load_translations()
+    assert reader.find_changes() == set()
+
+    folder.join('es.yml').write(u'es:\n    greeting: Hola mundo\n')
+    os.utime(str(folder.join('es.yml')), (1, 1))
+    folder.join('fr.yml').write(u'fr:\n    greeting: Bonjour\n')
+    assert reader.find_changes() == set(['es', 'fr'])
+    assert reader.find_changes() == set()
+
+    folder.join('en.yml').remove()
+    assert reader.find_changes() == set(['en'])
+
+
+def test_get_files_data_doesnt_hide_changes(tmpdir):
+    folder = tmpdir.mkdir('locales')
+    folder.join('es.yml').write(u'es:\n    greeting: Hola\n')
+    reader = Reader(str(folder))
+    reader.load_translations()
+
+    folder.join('es.yml').write(u'es:\n    greeting: Hola mundo\n')
+    os.utime(str(folder.join('es.yml')), (1, 1))
+    data = reader.get_files_data()
+    assert data[str(folder.join('es.yml'))] == [('es', {'greeting': u'Hola mundo'})]
+    assert reader.get_loaded_files_data() == {}
+    assert reader.find_changes() == set(['es'])
+
+
+LOCALE_FILES = sorted([
+    *glob(join(LOCALES_TEST, '*.yml')),
+    *glob(join(LOCALES_TEST, '*', '*.yml')),
+    *glob(join(LOCALES_TEST2, '*.yml')),
+])
+
+
+@pytest.mark.parametrize('filepath', LOCALE_FILES)
+def test_yaml_backends_conformance(filepath):
+    pytest.importorskip('yaml')
+    expected = get_strict_yaml_data(filepath, backend='poyo')
+    assert get_strict_yaml_data(filepath, backend='pyyaml') == expected
+    assert get_strict_yaml_data(filepath) == expected
+
+
+@pytest.mark.parametrize('yaml, key, value', [
+    (u'en:\n    n: {count}\n', 'n', u'{count}'),
+    (u'en:\n    a: [draft]\n', 'a', u'[draft]'),
+    (u'en:\n    a: [x]\n    b: yes\n    c: 3\n', 'a', u'[x]'),
+])
+def test_yaml_backends_flow_collections(yaml, key, value):
+    pytest.importorskip('yaml')
+    expected = parse_yaml(yaml, backend='poyo')
+    assert expected['en'][key] == value
+    assert parse_yaml(yaml, backend='pyyaml') == expected
+    assert parse_yaml(yaml) == expected
+
+
+def test_json_backend_conformance(tmpdir):
+    yamlpath = tmpdir.join('en.yml')
+    yamlpath.write_text(u"""
+en:
+    greeting: Hello
+    accented: "Jalape\u00f1o"
+    n: "{count}"
+    apple:
+        one: One apple
+        other: "{count} apples"
+    count: 3
+    ratio: 1.5
+    nothing: null
+    yes_is_text: yes
+    flag: true
+""", encoding='utf8')
+    jsonpath = tmpdir.mkdir('json').join('en.json')
+    jsonpath.write_text(u"""{"en": {
+    "greeting": "Hello",
+    "accented": "Jalape\\u00f1o",
+    "n": "{count}",
+    "apple": {"one": "One apple", "other": "{count} apples"},
+    "count": 3,
+    "ratio": 1.5,
+    "nothing": null,
+    "yes_is_text": "yes",
+    "flag": true
+}}""", encoding='utf8')
+    expected = get_strict_yaml_data(str(yamlpath), backend='poyo')
+    assert get_json_data(str(jsonpath)) == expected
+
+    reader = Reader(str(tmpdir.join('json')))
+    reader.register_loader('json', get_json_data)
+    data = reader.load_translations()
+    assert data['en'] == expected['en']
+
+
+def test_yaml_backends_load_translations():
+    pytest.importorskip('yaml')
+    folders = [LOCALES_TEST, LOCALES_TEST2]
+    expected = Reader(folders, yaml_backend='poyo').load_translations()
+    assert Reader(folders, yaml_backend='pyyaml').load_translations() == expected
+    assert Reader(folders).load_translations() == expected
+
+
+def test_yaml_parser_pyyaml_types():
+    pytest.importorskip('yaml')
+    yaml = u'''
+octal: 010
+yes_is_text: yes
+on_is_text: on
+empty: ~
+boolean: True
+exp: 1e3
+quoted: "12"
+'''
+    assert parse_yaml(yaml, backend='pyyaml') == parse_yaml(yaml, backend='poyo')
+
+
+@pytest.mark.parametrize('yaml', [
+    u"a: 'It''s'\n",
+    u'a: "Tab\\there"\n',
+    u'a: hello   \n',
+    u'a: 10 \n',
+    u'a: x # comment\n',
+    u'a: x\r\nb: y\r\n',
+    u'a  : x\n',
+    u'a: &anchor x\nb: *anchor\n',
+    u'a: !!str 1\n',
+    u'a:\n',
+    u'a:\nb: 1\n',
+    u"a: ''\n",
+    u"'a b': \"x\"\n",
+    u'a:\n    - x\n    - \'y\'\n',
+])
+def test_yaml_parser_pyyaml_reads_like_poyo(yaml):
+    pytest.importorskip('yaml')
+    expected = parse_yaml(yaml, backend='poyo')
+    assert parse_yaml(yaml, backend='pyyaml') == expected
+    assert parse_yaml(yaml) == expected
+
+
+def test_yaml_parser_fallback():
+    yaml = u'''meh: @2%
+backtick: `poyo` is cool
+'''
+    expected = {'meh': '@2%', 'backtick': '`poyo` is cool'}
+    assert parse_yaml(yaml) == expected
@@ -1,3 +1,8 @@
+import asyncio
+import sys
+import threading
+
+import pytest
 from babel import Locale
 from babel.dates import UTC, get_timezone
 
@@ -42,3 +47,115 @@ def test_get_timezone():
     tzinfo = get_timezone('America/Lima')
     rm = RequestManager(get_timezone=lambda: tzinfo, default_timezone=UTC)
     assert rm.get_timezone() == tzinfo
+
+
+def test_get_timezone_by_name():
+    rm = RequestManager(get_timezone=lambda: 'America/Lima', default_timezone=UTC)
+    assert rm.get_timezone() == get_timezone('America/Lima')
+
+    rm = RequestManager(get_timezone=lambda: 'Mars', default_timezone=UTC)
+    assert rm.get_timezone() == UTC
+
+
+def test_available_locales():
+    rm = RequestManager(available_locales=['en', 'es_PE', Locale('pt', 'BR')])
+    assert rm.available_locales == ['en', 'es_PE', 'es', 'pt_BR', 'pt']
+
+    rm = RequestManager(default_locale='es')
+    assert rm.available_locales == ['es']
+
+
+def test_negotiate():
+    rm = RequestManager(
+        default_locale='en', available_locales=['en', 'es_PE', 'pt_BR', 'nb_NO'])
+    assert rm.negotiate(['fr', 'es_PE', 'en']) == Locale('es', 'PE')
+    assert rm.negotiate(['fr', 'es-MX']) == Locale('es')
+    assert rm.negotiate([Locale('pt', 'BR')]) == Locale('pt', 'BR')
+    assert rm.negotiate([Locale('pt', 'PT')]) == Locale('pt')
+    assert rm.negotiate(['no_NO']) == Locale('nb', 'NO')
+    assert rm.negotiate('es') == Locale('es')
+    assert rm.negotiate(['fr', 'de']) == Locale('en')
+    assert rm.negotiate(None) == Locale('en')
+    assert rm.negotiate([]) == Locale('en')
+
+
+def test_negotiate_is_memoized():
+    rm = RequestManager(available_locales=['en', 'es'])
+    rm.negotiate(['fr', 'es'])
+    rm.negotiate(['fr', 'es'])
+    assert rm._negotiate.cache_info().hits == 1
+
+
+def test_request_context():
+    calls = []
+
+    def get_locale():
+        calls.append(1)
+        return 'es-PE'
+
+    rm = RequestManager(get_locale=get_locale, get_timezone=lambda: 'America/Lima')
+    assert rm.get_request_context() is None
+
+    with rm.request_context() as context:
+        assert context.locale == Locale('es', 'PE')
+        assert context.timezone == get_timezone('America/Lima')
+        for _ in range(3):
+            assert rm.get_locale() == Locale('es', 'PE')
+            assert rm.get_timezone() == get_timezone('America/Lima')
+        assert len(calls) == 1
+
+        with rm.request_context(locale='en', timezone='UTC'):
+            assert rm.get_locale() == Locale('en')
+            assert rm.get_timezone() == UTC
+        assert rm.get_locale() == Locale('es', 'PE')
+
+    assert rm.get_request_context() is None
+    assert rm.get_locale() == 'es-PE'
+
+
+def test_bind_request():
+    rm = RequestManager()
+    token = rm.bind_request(locale='klingon', timezone='Mars')
+    assert rm.get_locale() == Locale('en')
+    assert rm.get_timezone() == UTC
+    rm.unbind_request(token)
+    assert rm.get_request_context() is None
+
+
+def test_request_context_threads():
+    rm = RequestManager()
+    seen = {}
+    ready = threading.Event()
+
+    def worker():
+        with rm.request_context(locale='es'):
+            ready.set()
+            seen['worker'] = rm.get_locale()
+
+    with rm.request_context(locale='pt'):
+        thread = threading.Thread(target=worker)
+        thread.start()
+        ready.wait(1)
+        thread.join()
+        assert rm.get_locale() == Locale('pt')
+    assert seen['worker'] == Locale('es')
+
+
+@pytest.mark.skipif(sys.version_info < (3, 7), reason="requires contextvars")
+def test_request_context_asyncio():
+    rm = RequestManager()
+
+    async def handle(locale):
+        with rm.request_context(locale=locale):
+            await asyncio.sleep(0.01)
+            return rm.get_locale()
+
+    async def main():
+        return await asyncio.gather(handle('es'), handle('pt'), handle('fr'))
+
+    loop = asyncio.new_event_loop()
+    try:
+        result = loop.run_until_complete(main())
+    finally:
+        loop.close()
+    assert result == [Locale('es'), Locale('pt'), Locale('fr')]
@@ -33,6 +33,21 @@ def test_normalize_locale():
     assert utils.normalize_locale(1) is None
 
 
+def test_normalize_locale_cache():
+    utils.normalize_locale.cache_clear()
+    first = utils.normalize_locale('es-PE')
+    assert utils.normalize_locale('es-PE') is first
+    assert utils.normalize_locale('klingon') is None
+    assert utils.normalize_locale('klingon') is None
+
+    info = utils.normalize_locale.cache_info()
+    assert info.hits == 2
+    assert info.misses == 2
+
+    utils.normalize_locale.cache_clear()
+    assert utils.normalize_locale.cache_info().currsize == 0
+
+
 def test_normalize_timezone():
     assert utils.normalize_timezone(timezone('America/Lima')) == timezone('America/Lima')
     assert utils.normalize_timezone('America/Lima') == timezone('America/Lima')
@@ -40,6 +55,21 @@ def test_normalize_timezone():
     assert utils.normalize_timezone(None) is None
 
 
+def test_normalize_timezone_cache():
+    utils.normalize_timezone.cache_clear()
+    first = utils.normalize_timezone('America/Lima')
+    assert utils.normalize_timezone('America/Lima') is first
+    assert utils.normalize_timezone('Mars') is None
+    assert utils.normalize_timezone('Mars') is None
+
+    info = utils.normalize_timezone.cache_info()
+    assert info.hits == 2
+    assert info.misses == 2
+
+    utils.normalize_timezone.cache_clear()
+    assert utils.normalize_timezone.cache_info().currsize == 0
+
+
 def test_locale_to_str():
     assert utils.locale_to_str(Locale('en', 'US')) == 'en_US'
     assert utils.locale_to_str(Locale('es')) == 'es'
@@ -60,3 +90,19 @@ def test_flatten():
     }
     expected = {'a': 1, 'c.a': 2, 'c.b.x': 5, 'c.b.y': 10, 'd': [1, 2, 3]}
     assert utils._flatten(dic) == expected
+
+
+def test_iter_flatten():
+    dic = {'a': 1, 'c': {'a': 2, 'b': {'x': 5, 0: 'zero'}, 'e': {}}, 'd': 3}
+    assert list(utils._iter_flatten(dic)) == [
+        ('a', 1), ('c.a', 2), ('c.b.x', 5), ('c.b.0', 'zero'), ('d', 3),
+    ]
+
+
+def test_flatten_deep():
+    dic = leaf = {}
+    for _ in range(5000):
+        leaf['k'] = {}
+        leaf = leaf['k']
+    leaf['k'] = 'deep'
+    assert utils._flatten(dic) == {'.'.join(['k'] * 5001): 'deep'}